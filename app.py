@@ -1,9 +1,18 @@
 import streamlit as st
 st.set_page_config(page_title="NLP NAVIGATOR", page_icon="🧠", layout="wide", initial_sidebar_state="expanded")
 
+from features import startup_profile
+startup_profile.install()  # No-op unless NLP_NAVIGATOR_PROFILE_STARTUP=1
+
 from features.functions import load_lottie_file
+from features.model_registry import loading_models, memory_report, start_warmup, warmup_errors
+from features.inference_cache import get_inference_cache
+from features.inference_scheduler import scheduler_report
+from features import instrumentation
 import streamlit_lottie as st_lottie
 
+start_warmup()  # Loads the common models in the background (once per server process)
+
 def intro():
     st.header("NLP NAVIGATOR : Represents AI and NLP capabilities 🧠 ", divider='rainbow')
 
@@ -105,6 +114,39 @@ Start exploring NLP Navigator and harness the power of AI-driven text analytics
         with st.expander("🌍 How NLP Navigator Solves Real-World Problems?"):
             st.write("NLP Navigator isn’t just a tool—it solves real-world problems using NLP and AI techniques.")
 
+# 🧠 Models currently resident in this server process (shared by all pages)
+if loading_models():
+    st.sidebar.info(f"⏳ Loading models: {', '.join(loading_models())}")
+for failed_model, error in warmup_errors().items():
+    st.sidebar.warning(f"Model '{failed_model}' failed to preload: {error}")
+
+with st.sidebar.expander("🧠 Loaded Models"):
+    loaded_models = memory_report()
+    if loaded_models:
+        st.dataframe(loaded_models, hide_index=True)
+    else:
+        st.caption("No models loaded yet.")
+    st.caption("Inference cache")
+    st.dataframe([get_inference_cache().stats()], hide_index=True)
+    if scheduler_report():
+        st.caption("Micro-batching (requests shared across sessions)")
+        st.dataframe(scheduler_report(), hide_index=True)
+
+# ⏱️ Per-stage timings for this session, plus p50/p95 per stage across all sessions
+if instrumentation.METRICS_ENABLED:
+    with st.sidebar.expander("⏱️ Stage Timings"):
+        spans = instrumentation.session_spans()
+        if spans:
+            st.dataframe(spans, hide_index=True, column_order=["span", "wall_ms", "cpu_ms", "rss_delta_mb", "ts"])
+        else:
+            st.caption("No stages recorded in this session yet.")
+        if st.button("Aggregate Metrics Log"):
+            st.dataframe(instrumentation.aggregate_metrics(), hide_index=True)
+
+if startup_profile.PROFILE_ENABLED:
+    with st.sidebar.expander("⏱️ Startup Profile"):
+        st.dataframe(startup_profile.profile_report(), hide_index=True)
+
 # 🔓 No authentication required – app starts here
 pg = st.navigation([
     st.Page(title="Home", page=intro, icon="🏠"),
@@ -0,0 +1,45 @@
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+# ✅ Deterministic synthetic corpora: the same seed and size always produce the same rows
+POSITIVE_WORDS = ["great", "excellent", "love", "happy", "wonderful", "fast", "reliable", "helpful", "amazing", "secure"]
+NEGATIVE_WORDS = ["terrible", "awful", "hate", "sad", "broken", "slow", "buggy", "rude", "disappointing", "leak"]
+NEUTRAL_WORDS = [
+    "the", "product", "service", "update", "team", "delivery", "price", "support", "app", "order", "today",
+    "report", "network", "battery", "screen", "account", "review", "feature", "release", "customer", "week",
+    "market", "city", "weather", "phone", "software", "meeting", "travel", "system", "data",
+]
+LOCATIONS = ["Paris", "London", "Tokyo", "Berlin", "New York", "Mumbai", "Sydney", "Toronto", "Nairobi", "Lima",
+             "Unknown Town"]
+START_DATE = date(2024, 1, 1)
+
+
+def vocabulary():
+    """Every word the generator can emit (used to build the tiny test tokenizers)."""
+    return POSITIVE_WORDS + NEGATIVE_WORDS + NEUTRAL_WORDS
+
+
+def _sentence(rng):
+    words = rng.choices(NEUTRAL_WORDS, k=rng.randint(4, 18))
+    polarity = rng.random()
+    if polarity < 0.4:
+        words += rng.choices(POSITIVE_WORDS, k=rng.randint(1, 3))
+    elif polarity < 0.8:
+        words += rng.choices(NEGATIVE_WORDS, k=rng.randint(1, 3))
+    rng.shuffle(words)
+    return " ".join(words).capitalize() + "."
+
+
+def make_corpus(rows, seed=0, days=90):
+    """Returns a DataFrame with Date, Text, Location and Sentiment columns."""
+    rng = random.Random(seed)
+    texts = [" ".join(_sentence(rng) for _ in range(rng.randint(1, 3))) for _ in range(rows)]
+    dates = sorted(START_DATE + timedelta(days=rng.randrange(days)) for _ in range(rows))
+    return pd.DataFrame({
+        "Date": pd.to_datetime(dates),
+        "Text": texts,
+        "Location": [rng.choice(LOCATIONS) for _ in range(rows)],
+        "Sentiment": [rng.choice(["POSITIVE", "NEGATIVE"]) for _ in range(rows)],
+    })
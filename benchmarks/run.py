@@ -0,0 +1,323 @@
+"""Offline benchmarks for the analysis hot paths.
+
+Every (case, size) runs in a fresh process with tiny local models, an empty cache
+directory and a scratch feedback database, so runs are repeatable and isolated:
+
+    python -m benchmarks.run                       # 1k, 10k and 100k rows, all cases
+    python -m benchmarks.run --sizes 1000 --cases sentiment_scores,forecast_trends
+    python -m benchmarks.run --save-baseline       # store this run as the reference
+
+Results are appended to benchmarks/results/history.json and compared with
+benchmarks/results/baseline.json; the exit status is 1 when anything regressed.
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+HISTORY_FILE = os.path.join(RESULTS_DIR, "history.json")
+BASELINE_FILE = os.path.join(RESULTS_DIR, "baseline.json")
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+REQUEST_ROWS = 256  # Rows per call for the batched paths (similar to an upload chunk)
+
+
+class Timer:
+    """Collects per-operation latencies and the number of items each operation handled."""
+
+    def __init__(self):
+        self.latencies = []
+        self.items = 0
+
+    @contextmanager
+    def measure(self, items=1):
+        start = time.perf_counter()
+        yield
+        self.latencies.append(time.perf_counter() - start)
+        self.items += items
+
+
+def bench_sentiment_scores(corpus, timer):
+    """run_cached + signed_score, i.e. get_sentiment_scores on pages 5 and 6 (all cache misses)."""
+    from features.inference import run_cached, signed_score
+
+    texts = corpus["Text"].tolist()
+    for offset in range(0, len(texts), REQUEST_ROWS):
+        batch = texts[offset:offset + REQUEST_ROWS]
+        with timer.measure(len(batch)):
+            [signed_score(result) for result in run_cached("sentiment", batch)]
+
+
+def bench_emotions(corpus, timer):
+    """Batched emotion detection as in the corpus mode of page 1."""
+    from features.inference import run_cached
+
+    texts = corpus["Text"].tolist()
+    for offset in range(0, len(texts), REQUEST_ROWS):
+        batch = texts[offset:offset + REQUEST_ROWS]
+        with timer.measure(len(batch)):
+            run_cached("emotion", batch)
+
+
+def bench_forecast_trends(corpus, timer):
+    """forecast_trends as on page 7: one refresh per day of data, each re-pivoting the history seen so far."""
+    from features.forecasting import SentimentForecaster, daily_counts
+
+    forecaster = SentimentForecaster()
+    for day in sorted(corpus["Date"].unique()):
+        seen = corpus[corpus["Date"] <= day]
+        with timer.measure(len(seen)):
+            counts = daily_counts(seen, date_column="Date", label_column="Sentiment")
+            forecaster.update(counts)
+            forecaster.forecast(counts, horizon=5)
+
+
+def bench_save_feedback(corpus, timer):
+    """One save_feedback call per row against a scratch SQLite database."""
+    from features.feedback_store import save_feedback
+
+    for i, text in enumerate(corpus["Text"]):
+        with timer.measure():
+            save_feedback({"Name": f"user{i}", "Email": f"user{i}@example.com", "Rating": i % 5 + 1,
+                           "Easy to Use": "Yes", "Challenges": "", "General Feedback": text})
+
+
+def bench_similarity_encode(corpus, timer):
+    """Encoding documents into a float32 EmbeddingIndex (page 3, corpus mode)."""
+    from features.embedding_index import EmbeddingIndex
+    from features.model_registry import get_model
+
+    model = get_model("embedding")
+
+    def encode(texts):
+        return model.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+
+    index = EmbeddingIndex("benchmark", model.get_sentence_embedding_dimension(), "float32", "tiny-embedding")
+    texts = corpus["Text"].tolist()
+    for offset in range(0, len(texts), REQUEST_ROWS * 4):
+        batch = texts[offset:offset + REQUEST_ROWS * 4]
+        with timer.measure(len(batch)):
+            index.add(batch, encode)
+
+
+def bench_similarity_search(corpus, timer):
+    """Top-10 search over the whole index, 64 queries per call (index built untimed)."""
+    from features.embedding_index import EmbeddingIndex
+    from features.model_registry import get_model
+
+    model = get_model("embedding")
+
+    def encode(texts):
+        return model.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+
+    index = EmbeddingIndex("benchmark", model.get_sentence_embedding_dimension(), "float32", "tiny-embedding")
+    index.add(corpus["Text"].tolist(), encode, batch_size=1024)
+    queries = corpus["Text"].head(64 * 10).tolist()
+    for offset in range(0, len(queries), 64):
+        batch = encode(queries[offset:offset + 64])
+        with timer.measure(len(batch)):
+            index.search(batch, k=10)
+
+
+def bench_word_frequencies(corpus, timer):
+    """Streaming word counts for the Word Cloud page, one 1,000-row text block per call."""
+    from features.word_frequencies import count_text_file
+
+    texts = corpus["Text"].tolist()
+    for offset in range(0, len(texts), 1_000):
+        block = "\n".join(texts[offset:offset + 1_000]).encode("utf-8")
+        with timer.measure(min(1_000, len(texts) - offset)):
+            count_text_file(io.BytesIO(block))
+
+
+def bench_word_cloud_render(corpus, timer):
+    """Word cloud layout and PNG encoding (render cache misses) at three vocabulary caps."""
+    from features.word_frequencies import count_text, render_word_cloud
+
+    frequencies = count_text("\n".join(corpus["Text"]))
+    for max_words in (200, 1_000, 2_000):
+        with timer.measure():
+            render_word_cloud(frequencies, max_words=max_words)
+
+
+def bench_trend_render(corpus, timer):
+    """Sentiment trend chart as on pages 2 and 5: bucketing, LTTB downsampling and PNG encoding."""
+    from features.chart_rendering import resample_trend, trend_figure
+
+    scores = corpus.assign(Score=np.linspace(-1, 1, len(corpus)))
+    for freq in ("D", "h"):
+        with timer.measure(len(scores)):
+            buckets, freq = resample_trend(scores, "Date", "Score", freq=freq)
+            figure, _ = trend_figure(buckets, freq, "Sentiment Over Time", "Sentiment Score")
+            figure.savefig(io.BytesIO(), format="png")
+
+
+CASES = {
+    "sentiment_scores": bench_sentiment_scores,
+    "emotions": bench_emotions,
+    "forecast_trends": bench_forecast_trends,
+    "save_feedback": bench_save_feedback,
+    "similarity_encode": bench_similarity_encode,
+    "similarity_search": bench_similarity_search,
+    "word_frequencies": bench_word_frequencies,
+    "word_cloud_render": bench_word_cloud_render,
+    "trend_render": bench_trend_render,
+}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _run_case(case, rows, seed):
+    """Runs one case in the current (fresh) process and returns its result row."""
+    scratch = tempfile.mkdtemp(prefix="nlp-navigator-bench-")
+    os.environ["NLP_NAVIGATOR_CACHE_DIR"] = os.path.join(scratch, "cache")
+    os.environ["NLP_NAVIGATOR_FEEDBACK_DB"] = os.path.join(scratch, "feedback.sqlite3")
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    row = {"case": case, "rows": rows}
+    try:
+        from benchmarks.corpus import make_corpus
+        from benchmarks.tiny_models import register_tiny_models
+
+        register_tiny_models(os.path.join(scratch, "models"))  # Removed with the scratch directory
+        corpus = make_corpus(rows, seed=seed)
+        timer = Timer()
+        CASES[case](corpus, timer)
+    except ImportError as e:
+        return {**row, "skipped": f"missing dependency: {e.name}"}
+    except Exception:
+        return {**row, "error": traceback.format_exc(limit=3)}
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    latencies = np.array(timer.latencies) * 1000
+    seconds = sum(timer.latencies)
+    peak_rss = _peak_rss_mb()
+    return {
+        **row,
+        "operations": len(latencies),
+        "items": timer.items,
+        "seconds": round(seconds, 4),
+        "throughput": round(timer.items / seconds, 2) if seconds else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+        "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None,
+    }
+
+
+def run_isolated(case, rows, seed=0):
+    """Runs a case in its own spawned process so peak RSS and caches are per case."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(_run_case, case, rows, seed).result()
+
+
+def find_regressions(results, baseline, tolerance):
+    """Compares results with the baseline; returns human-readable regression messages."""
+    reference = {(row["case"], row["rows"]): row for row in baseline.get("results", [])}
+    regressions = []
+    for row in results:
+        base = reference.get((row["case"], row["rows"]))
+        if not base or "throughput" not in row or "throughput" not in base:
+            continue
+        label = f"{row['case']} @ {row['rows']:,} rows"
+        if base["throughput"] and row["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {row['throughput']:,.1f}/s vs baseline {base['throughput']:,.1f}/s")
+        if row["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {row['p95_ms']:.2f} ms vs baseline {base['p95_ms']:.2f} ms")
+        if base.get("peak_rss_mb") and row.get("peak_rss_mb") and row["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{label}: peak RSS {row['peak_rss_mb']:.0f} MB vs baseline {base['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the NLP Navigator hot paths on synthetic corpora.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated corpus sizes.")
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated cases to run.")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown before flagging.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--no-history", action="store_true", help="Don't append this run to the history file.")
+    args = parser.parse_args(argv)
+
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()]
+    unknown = [case for case in cases if case not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)} (available: {', '.join(CASES)})")
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    results = []
+    for case in cases:
+        for rows in sizes:
+            row = run_isolated(case, rows, args.seed)
+            results.append(row)
+            if "throughput" in row:
+                print(f"{case:<20} {rows:>8,} rows  {row['throughput']:>12,.1f} items/s  "
+                      f"p50 {row['p50_ms']:>9.2f} ms  p95 {row['p95_ms']:>9.2f} ms  p99 {row['p99_ms']:>9.2f} ms  "
+                      f"peak RSS {row['peak_rss_mb']} MB")
+            else:
+                print(f"{case:<20} {rows:>8,} rows  {row.get('skipped') or row.get('error')}")
+
+    run = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if not args.no_history:
+        _write_json(HISTORY_FILE, _read_json(HISTORY_FILE, []) + [run])
+
+    regressions = find_regressions(results, _read_json(BASELINE_FILE, {}), args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if args.save_baseline:
+        _write_json(BASELINE_FILE, run)
+        print(f"Saved baseline to {BASELINE_FILE}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import os
+import tempfile
+
+from benchmarks.corpus import vocabulary
+
+# ✅ Tiny randomly initialized models built locally, so benchmarks run offline and fast
+HIDDEN_SIZE = 32
+SEED = 0
+EMOTION_LABELS = ["anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise"]
+
+_directory = None
+_temporary_directory = None  # Removed when garbage collected or at exit
+
+
+def _model_directory():
+    """Writes a vocab file once per process and returns the directory holding it.
+
+    Uses the directory given to register_tiny_models, else a TemporaryDirectory.
+    """
+    global _directory, _temporary_directory
+    if _directory is None:
+        _temporary_directory = tempfile.TemporaryDirectory(prefix="nlp-navigator-tiny-")
+        _directory = _temporary_directory.name
+    vocab_path = os.path.join(_directory, "vocab.txt")
+    if not os.path.exists(vocab_path):
+        os.makedirs(_directory, exist_ok=True)
+        with open(vocab_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "."] + vocabulary()))
+    return _directory
+
+
+def _tokenizer():
+    from transformers import BertTokenizerFast
+    return BertTokenizerFast(vocab_file=os.path.join(_model_directory(), "vocab.txt"))
+
+
+def _config(labels=None):
+    from transformers import BertConfig
+    config = BertConfig(
+        vocab_size=_tokenizer().vocab_size, hidden_size=HIDDEN_SIZE, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=HIDDEN_SIZE * 2, max_position_embeddings=512,
+    )
+    if labels:
+        config.num_labels = len(labels)
+        config.id2label = dict(enumerate(labels))
+        config.label2id = {label: i for i, label in enumerate(labels)}
+    return config
+
+
+def tiny_classifier(labels):
+    """A text-classification pipeline with the same output contract as the real models."""
+    import torch
+    from transformers import BertForSequenceClassification, pipeline
+
+    torch.manual_seed(SEED)
+    model = BertForSequenceClassification(_config(labels)).eval()
+    return pipeline("text-classification", model=model, tokenizer=_tokenizer())
+
+
+def tiny_sentence_transformer():
+    """A SentenceTransformer (BERT + mean pooling) saved to and loaded from a local directory."""
+    import torch
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertModel
+
+    torch.manual_seed(SEED)
+    path = os.path.join(_model_directory(), "embedding")
+    if not os.path.exists(path):
+        BertModel(_config()).save_pretrained(path)
+        _tokenizer().save_pretrained(path)
+    transformer = models.Transformer(path)
+    return SentenceTransformer(modules=[transformer, models.Pooling(transformer.get_word_embedding_dimension())])
+
+
+def register_tiny_models(directory=None):
+    """Points the registry's sentiment, emotion and embedding names at the tiny models.
+
+    Their vocab and saved weights go to `directory` (owned and removed by the caller) if given.
+    """
+    global _directory
+    from features.model_registry import register_model
+
+    if directory is not None:
+        _directory = directory
+
+    register_model("sentiment", lambda: tiny_classifier(["NEGATIVE", "POSITIVE"]), model_id="tiny-sentiment")
+    register_model("emotion", lambda: tiny_classifier(EMOTION_LABELS), model_id="tiny-emotion")
+    register_model("embedding", tiny_sentence_transformer, model_id="tiny-embedding")
@@ -0,0 +1,87 @@
+"""Headless batch analysis for NLP Navigator.
+
+Streams a CSV/JSONL file through one analysis in chunks and writes CSV or Parquet:
+
+    python cli.py sentiment reviews.csv scored.parquet --text-column Text --workers 4 --torch-threads 2
+    python cli.py forecast posts.jsonl forecast.csv --date-column Date --horizon 7
+
+Stored feedback can be listed page by page or exported the same way:
+
+    python cli.py feedback list --limit 20 --before-id 120
+    python cli.py feedback export feedback.parquet
+"""
+import argparse
+import sys
+
+from features.batch_engine import ANALYSES, CHUNK_ROWS, run_analysis
+from features.feedback_store import count_feedback, export_feedback, read_feedback
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run an NLP Navigator analysis over a large CSV/JSONL file.")
+    parser.add_argument("analysis", choices=sorted(ANALYSES), help="Analysis to run on every row.")
+    parser.add_argument("input", help="Input .csv or .jsonl file (may be compressed).")
+    parser.add_argument("output", help="Output .csv or .parquet file.")
+    parser.add_argument("--text-column", default="Text", help="Column holding the text (default: Text).")
+    parser.add_argument("--location-column", default="Location", help="Column holding place names (geocode).")
+    parser.add_argument("--date-column", default="Date", help="Column holding dates (forecast).")
+    parser.add_argument("--horizon", type=int, default=5, help="Days to forecast (forecast).")
+    parser.add_argument("--top-n", type=int, default=5, help="Key phrases per row (keyphrases).")
+    parser.add_argument("--geocode-fallback", action="store_true",
+                        help="Look up places missing from the gazetteer on Nominatim (forces one worker).")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows read and scored per chunk.")
+    parser.add_argument("--batch-size", type=int, default=32, help="Model batch size inside a chunk.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes, each with its own model copy (default: cores / torch threads; 0 = in-process).")
+    parser.add_argument("--torch-threads", type=int, default=1, help="Torch intra-op threads per worker.")
+    parser.add_argument("--no-cache", action="store_true", help="Skip the shared on-disk inference cache.")
+    return parser.parse_args(argv)
+
+
+def parse_feedback_args(argv):
+    parser = argparse.ArgumentParser(prog="cli.py feedback", description="List or export stored feedback.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    listing = commands.add_parser("list", help="Print one page of feedback, newest first.")
+    listing.add_argument("--limit", type=int, default=20, help="Entries per page (default: 20).")
+    listing.add_argument("--before-id", type=int, default=None,
+                         help="Show entries older than this ID (the last ID of the previous page).")
+    export = commands.add_parser("export", help="Write every entry to a file.")
+    export.add_argument("output", help="Output .csv or .parquet file.")
+    return parser.parse_args(argv)
+
+
+def feedback_main(argv):
+    args = parse_feedback_args(argv)
+    if args.command == "list":
+        page = read_feedback(before_id=args.before_id, page_size=args.limit)
+        print(page.to_string(index=False) if len(page) else "No feedback.")
+        if len(page) == args.limit:
+            print(f"\nNext page: --before-id {page['ID'].iloc[-1]}", file=sys.stderr)
+        return
+    file_format = "parquet" if args.output.endswith(".parquet") else "csv"
+    export_feedback(args.output, file_format=file_format)
+    print(f"Wrote {args.output} ({count_feedback():,} entries).", file=sys.stderr)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["feedback"]:
+        return feedback_main(argv[1:])
+    args = parse_args(argv)
+
+    def report(rows, elapsed):
+        print(f"\r{rows:,} rows · {rows / max(elapsed, 1e-9):,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+    rows = run_analysis(
+        args.analysis, args.input, args.output,
+        text_column=args.text_column, chunk_rows=args.chunk_rows, workers=args.workers,
+        torch_threads=args.torch_threads, progress_callback=report,
+        location_column=args.location_column, date_column=args.date_column, horizon=args.horizon,
+        top_n=args.top_n, geocode_fallback=args.geocode_fallback, batch_size=args.batch_size,
+        use_cache=not args.no_cache,
+    )
+    print(f"\nWrote {args.output} ({rows:,} input rows).", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
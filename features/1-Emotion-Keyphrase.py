@@ -1,27 +1,30 @@
 import streamlit as st
-from transformers.pipelines import pipeline  
-from keybert import KeyBERT
-from sentence_transformers import SentenceTransformer
 import pandas as pd
+from features.functions import load_model
+from features.instrumentation import span
+from features.model_registry import EMBEDDING_MODEL_ID, get_model
+from features.inference import run_cached
+from features.keyphrase_corpus import corpus_top_keyphrases, extract_corpus_keyphrases
 
 st.title("Emotion Detection & Key Phrase Extraction 😊🏷️")
 st.write("Analyze your text for emotions and extract key phrases.")
 
-# Load emotion detection model safely
-@st.cache_resource
+# Load emotion detection model safely (shared process-wide via the model registry)
+@span("load_emotion_model")
 def load_emotion_model():
     try:
-        return pipeline("text-classification", model="j-hartmann/emotion-english-distilroberta-base")
+        return load_model("emotion")
     except Exception as e:
         st.error("Error loading emotion detection model.")
         st.error(str(e))
         return None  # Prevent crashes
 
 # Load KeyBERT model safely
-@st.cache_resource
+@span("load_keybert_model")
 def load_keybert_model():
     try:
-        return KeyBERT(SentenceTransformer("all-MiniLM-L6-v2"))
+        from keybert import KeyBERT  # Imported on first use; pulls in sentence-transformers
+        return KeyBERT(model=load_model("embedding"))  # Shares the MiniLM used by Text Similarity
     except Exception as e:
         st.error("Error loading KeyBERT model.")
         st.error(str(e))
@@ -39,7 +42,8 @@ num_phrases = st.slider("Number of Key Phrases", min_value=1, max_value=10, valu
 if st.button("Analyze Text"):
     if user_text.strip():  # Ensure input isn't empty
         if emotion_model:
-            results = emotion_model(user_text.strip())
+            with span("emotion_analysis"):
+                results = run_cached("emotion", [user_text.strip()])  # Served from the inference cache when seen before
             st.write("### Emotion Analysis:")
             for result in results:
                 st.write(f"Emotion: **{result['label']}**, Confidence: **{result['score']:.2f}**")
@@ -47,9 +51,10 @@ if st.button("Analyze Text"):
         # Key Phrase Extraction
         if keybert_model:
             try:
-                key_phrases = keybert_model.extract_keywords(
-                    user_text.strip(), keyphrase_ngram_range=(1, 2), stop_words="english", top_n=num_phrases
-                )
+                with span("keyphrase_extraction"):
+                    key_phrases = keybert_model.extract_keywords(
+                        user_text.strip(), keyphrase_ngram_range=(1, 2), stop_words="english", top_n=num_phrases
+                    )
                 st.write("### Extracted Key Phrases:")
                 for phrase, score in key_phrases:
                     st.write(f"- *{phrase}* (Relevance: {score:.2f})")
@@ -58,3 +63,56 @@ if st.button("Analyze Text"):
                 st.code(str(e))
     else:
         st.warning("Please enter some text for analysis.")
+
+# 📚 Corpus Mode: per-document emotions and key phrases for a whole upload
+st.header("📚 Corpus Analysis")
+st.write("Upload a CSV (choose the text column) or a TXT file (one document per line).")
+corpus_file = st.file_uploader("Upload a `.csv` or `.txt` corpus", type=["csv", "txt"])
+
+if corpus_file:
+    if corpus_file.name.endswith(".csv"):
+        corpus_df = pd.read_csv(corpus_file)
+        text_column = st.selectbox("Text column", corpus_df.columns)
+        documents = corpus_df[text_column].dropna().astype(str).tolist()
+    else:
+        documents = [line.strip() for line in corpus_file.getvalue().decode("utf-8", errors="ignore").splitlines() if line.strip()]
+
+    if st.button("Analyze Corpus"):
+        if not documents:
+            st.warning("No documents found in the uploaded file.")
+        else:
+            embedding_model = get_model("embedding")
+
+            def encode_texts(texts):
+                return embedding_model.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+
+            # Emotions: batched and served from the inference cache
+            progress_bar = st.progress(0.0, text="Detecting emotions...")
+            with span("corpus_emotions"):
+                emotions = run_cached(
+                    "emotion", documents, batch_size=32,
+                    progress_callback=lambda done, total, _: progress_bar.progress(done / total, text=f"Emotions: {done:,}/{total:,} documents"),
+                )
+
+            # Key phrases: candidates embedded once for the whole corpus, documents embedded in batches
+            progress_bar.progress(0.0, text="Extracting key phrases...")
+            with span("corpus_keyphrases"):
+                key_phrases = extract_corpus_keyphrases(
+                    documents, encode_texts, EMBEDDING_MODEL_ID, top_n=num_phrases,
+                    progress_callback=lambda done, total: progress_bar.progress(done / total, text=f"Key phrases: {done:,}/{total:,} documents"),
+                )
+            progress_bar.empty()
+
+            results_df = pd.DataFrame({
+                "Document": documents,
+                "Emotion": [emotion["label"] for emotion in emotions],
+                "Confidence": [round(emotion["score"], 3) for emotion in emotions],
+                "Key Phrases": ["; ".join(phrase for phrase, _ in phrases) for phrases in key_phrases],
+            })
+            st.write("### Per-Document Results:")
+            st.dataframe(results_df, hide_index=True)
+            st.download_button("⬇️ Download Results (CSV)", results_df.to_csv(index=False), "corpus_analysis.csv", "text/csv")
+
+            st.write("### Top Key Phrases Across the Corpus:")
+            st.dataframe(corpus_top_keyphrases(key_phrases), hide_index=True)
+            st.bar_chart(results_df["Emotion"].value_counts())
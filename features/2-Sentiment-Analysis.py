@@ -1,17 +1,21 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from transformers import pipeline
+import time
+from features.functions import load_model
+from features.chart_rendering import BUCKETS, resample_trend, trend_figure
+from features.csv_ingestion import CSVChunkReader, missing_columns
+from features.instrumentation import span
+from features.inference import run_cached
 
 st.title("Sentiment Analysis: Comparison & Trends ⚖️📈")
 st.write("Compare sentiments between texts and visualize sentiment trends over time.")
 
-# Load sentiment analysis model
-@st.cache_resource
+# Load sentiment analysis model (shared process-wide via the model registry)
+@span("load_sentiment_model")
 def load_sentiment_model():
-    return pipeline("sentiment-analysis")
+    return load_model("sentiment")
 
-sentiment_model = load_sentiment_model()
+load_sentiment_model()  # Warm the shared model when the page opens
 
 # Sentiment Comparison Section
 st.header("Sentiment Comparison")
@@ -22,8 +26,8 @@ text2 = st.text_area("Enter the second text:")
 
 if st.button("Compare Sentiments"):
     if text1 and text2:
-        result1 = sentiment_model(text1)[0]
-        result2 = sentiment_model(text2)[0]
+        with span("sentiment_comparison"):
+            result1, result2 = run_cached("sentiment", [text1, text2])
         st.write(f"Text 1 Sentiment: **{result1['label']}** (Confidence: {result1['score']:.2f})")
         st.write(f"Text 2 Sentiment: **{result2['label']}** (Confidence: {result2['score']:.2f})")
     else:
@@ -34,25 +38,51 @@ st.header("Sentiment Trends")
 st.write("Visualize sentiment trends over time.")
 
 uploaded_file = st.file_uploader("Upload a CSV file with 'Date' and 'Text' columns")
+bucket = st.radio("Trend buckets", list(BUCKETS), horizontal=True, help="Auto uses hours for spans up to 3 days, days beyond")
+batch_size = st.select_slider("Batch size", options=[8, 16, 32, 64, 128], value=32, help="Rows scored per forward pass")
 if uploaded_file:
     try:
-        df = pd.read_csv(uploaded_file)
-        st.write("Data Preview:")
-        st.write(df.head())
-
-        if 'Text' not in df.columns or 'Date' not in df.columns:
+        missing = missing_columns(uploaded_file, ["Date", "Text"])  # Only the header is read here
+        if missing:
             st.error("The uploaded file must have 'Date' and 'Text' columns.")
         else:
-            df['Sentiment'] = df['Text'].apply(lambda x: sentiment_model(x)[0]['score'])
-            
-            # Plot sentiment trends
-            plt.figure(figsize=(10, 5))
-            plt.plot(df['Date'], df['Sentiment'], marker='o', label='Sentiment Score')
-            plt.title("Sentiment Over Time")
-            plt.xlabel("Date")
-            plt.ylabel("Sentiment Score")
-            plt.legend()
-            plt.grid()
-            st.pyplot(plt)
+            # Stream Date/Text chunks straight into scoring; only dates and scores are kept
+            progress_bar = st.progress(0.0, text="Scoring rows...")
+            reader = CSVChunkReader(uploaded_file, ["Date", "Text"], date_column="Date")
+            trend = []
+            start = time.perf_counter()
+            rows_before, progress_before = 0, 0.0
+
+            def report_progress(done, total, _):
+                # Interpolate between the bytes read before this chunk and after it
+                rows_done = rows_before + done
+                fraction = progress_before + (reader.progress() - progress_before) * done / total
+                rate = rows_done / max(time.perf_counter() - start, 1e-9)
+                progress_bar.progress(fraction, text=f"Scored {rows_done:,} rows ({rate:,.1f} rows/s)")
+
+            for chunk in reader:
+                if not trend:
+                    st.write("Data Preview:")
+                    st.write(chunk.head())
+                with span("sentiment_trend_scoring"):
+                    results = run_cached("sentiment", chunk['Text'].fillna("").tolist(), batch_size=batch_size,
+                                         progress_callback=report_progress)
+                trend.append(pd.DataFrame({"Date": chunk['Date'], "Sentiment": [result['score'] for result in results]}))
+                rows_before, progress_before = reader.rows, reader.progress()
+            elapsed = time.perf_counter() - start
+            df = pd.concat(trend, ignore_index=True) if trend else pd.DataFrame(columns=["Date", "Sentiment"])
+            st.write(f"⏱️ Scored **{len(df):,}** rows in **{elapsed:.1f}s** ({len(df) / max(elapsed, 1e-9):,.1f} rows/s)")
+            if reader.invalid_dates:
+                st.warning(f"Skipped {reader.invalid_dates:,} rows with an unparseable Date.")
+
+            # Plot sentiment trends (bucketed and downsampled, so chart cost doesn't grow with row count)
+            if df['Date'].isna().all():
+                st.error("The 'Date' column contains no valid dates.")
+            else:
+                with span("sentiment_trend_plot"):
+                    buckets, freq = resample_trend(df, "Date", "Sentiment", freq=BUCKETS[bucket])
+                    figure, points = trend_figure(buckets, freq, "Sentiment Over Time", "Sentiment Score")
+                    st.pyplot(figure)
+                    st.caption(f"📉 {len(buckets):,} {'hourly' if freq == 'h' else 'daily'} buckets, {points:,} points plotted.")
     except Exception as e:
-        st.error(f"An error occurred: {e}")
+        st.error(f"An error occurred: {e}")
\ No newline at end of file
@@ -1,71 +1,153 @@
 import streamlit as st
-import nltk
+import os
 import pandas as pd
-from nltk.corpus import stopwords
-from nltk.stem import PorterStemmer
-from transformers import pipeline
-from sentence_transformers import SentenceTransformer, util
+from features.functions import load_model
+from features.instrumentation import span
+from features.summarization import summarize_long
+from features.embedding_index import EmbeddingIndex
+from features.model_registry import EMBEDDING_MODEL_ID
+from features.text_preprocessing import iter_processed_chunks, ngram_counts, preprocess
 
 st.title("Text Analysis Suite 📝🔍")
 st.write("Perform text summarization, processing, and similarity comparison.")
 
-# Load Summarization Model
-@st.cache_resource
+# Load Summarization Model (shared process-wide via the model registry)
+@span("load_summarizer")
 def load_summarizer():
-    return pipeline("summarization", model="sshleifer/distilbart-cnn-12-6")
+    return load_model("summarizer")
 
-# Load Similarity Model
-@st.cache_resource
+# Load Similarity Model (same MiniLM instance KeyBERT uses)
+@span("load_similarity_model")
 def load_similarity_model():
-    return SentenceTransformer("all-MiniLM-L6-v2")
-
-summarizer = load_summarizer()
-similarity_model = load_similarity_model()
+    return load_model("embedding")
 
 # Text Summarization
 st.header("Text Summarization")
 user_text = st.text_area("Enter text to summarize:")
+summary_file = st.file_uploader("Or upload a long `.txt` document to summarize", type=["txt"])
+
+# Long documents are split on sentence boundaries, summarized chunk by chunk, then summarized again
+with st.expander("⚙️ Long-Document Settings"):
+    chunk_batch_size = st.slider("Chunks per batch", 1, 16, 4)
+    summary_workers = st.slider("Parallel workers", 1, os.cpu_count() or 1, 1)
+
 if st.button("Summarize"):
-    if user_text:
-        summary = summarizer(user_text, max_length=50, min_length=25, do_sample=False)
+    document = summary_file.getvalue().decode("utf-8", errors="ignore") if summary_file else user_text
+    if document.strip():
+        load_summarizer()  # Loaded on first use rather than when the page opens
+        status = st.empty()
+        partial_summaries = st.expander("🧩 Partial Summaries", expanded=False)
+
+        def show_level(level, window_count):
+            status.info(f"Round {level}: summarizing {window_count} chunks...")
+
+        def show_chunk(level, index, chunk_summary):
+            partial_summaries.markdown(f"**Round {level}, chunk {index + 1}:** {chunk_summary}")
+
+        with span("summarize_long"):
+            summary = summarize_long(
+                document, {"max_length": 50, "min_length": 25, "do_sample": False},
+                batch_size=chunk_batch_size, workers=summary_workers, on_chunk=show_chunk, on_level=show_level,
+            )
+        status.empty()
         st.write("### Summary:")
-        st.success(summary[0]['summary_text'])
+        st.success(summary)
     else:
         st.warning("Please enter some text to summarize.")
 
 # Text Processing
 st.header("Text Processing")
-nltk.download('stopwords')
 remove_stop_words_option = st.checkbox("Remove Stop Words")
 stemming_option = st.checkbox("Apply Stemming")
+lemmatization_option = st.checkbox("Apply Lemmatization")
+ngram_size = st.slider("N-gram size for frequency counts", 1, 3, 1)
+processing_options = {
+    "remove_stop_words": remove_stop_words_option,
+    "apply_stemming": stemming_option,
+    "apply_lemmatization": lemmatization_option,
+}
 
-def remove_stop_words(text):
-    stop_words = set(stopwords.words('english'))
-    words = text.split()
-    return ' '.join([word for word in words if word.lower() not in stop_words])
-
-def stem_text(text):
-    ps = PorterStemmer()
-    words = text.split()
-    return ' '.join([ps.stem(word) for word in words])
-
+# Shared preprocessing engine: resources load once, stems/lemmas are memoized
 if user_text:
-    processed_text = user_text
-    if remove_stop_words_option:
-        processed_text = remove_stop_words(processed_text)
-    if stemming_option:
-        processed_text = stem_text(processed_text)
-    st.write("### Processed Text:", processed_text)
+    with span("preprocess_text"):
+        processed_tokens = preprocess(user_text, **processing_options)
+    st.write("### Processed Text:", " ".join(processed_tokens))
+
+processing_file = st.file_uploader("Or process a large `.txt` file (streamed in chunks)", type=["txt"], key="processing_file")
+if processing_file and st.button("Process File"):
+    processing_file.seek(0)
+    with span("preprocess_file"):
+        counts = ngram_counts(iter_processed_chunks(processing_file, lowercase=True, **processing_options), n=ngram_size)
+    st.write(f"Processed **{sum(counts.values()):,}** {ngram_size}-grams (**{len(counts):,}** distinct).")
+    st.dataframe(pd.DataFrame(counts.most_common(50), columns=["N-gram", "Count"]), hide_index=True)
 
 # Text Similarity
 st.header("Text Similarity")
-text1 = st.text_area("Enter the first text:")
-text2 = st.text_area("Enter the second text:")
-if st.button("Check Similarity"):
-    if text1 and text2:
-        embeddings1 = similarity_model.encode(text1, convert_to_tensor=True)
-        embeddings2 = similarity_model.encode(text2, convert_to_tensor=True)
-        similarity_score = util.pytorch_cos_sim(embeddings1, embeddings2).item()
-        st.write(f"Semantic Similarity Score: **{similarity_score:.2f}**")
-    else:
-        st.warning("Please enter both texts for comparison.")
+similarity_mode = st.radio("Mode", ["Compare Two Texts", "Search a Corpus"], horizontal=True)
+
+if similarity_mode == "Compare Two Texts":
+    text1 = st.text_area("Enter the first text:")
+    text2 = st.text_area("Enter the second text:")
+    if st.button("Check Similarity"):
+        if text1 and text2:
+            from sentence_transformers import util
+            similarity_model = load_similarity_model()
+            with span("similarity_encode"):
+                embeddings1 = similarity_model.encode(text1, convert_to_tensor=True)
+                embeddings2 = similarity_model.encode(text2, convert_to_tensor=True)
+            similarity_score = util.pytorch_cos_sim(embeddings1, embeddings2).item()
+            st.write(f"Semantic Similarity Score: **{similarity_score:.2f}**")
+        else:
+            st.warning("Please enter both texts for comparison.")
+else:
+    # Corpus mode: a persisted, memory-mapped embedding index that can be extended across sessions
+    similarity_model = load_similarity_model()
+
+    def encode_texts(texts):
+        return similarity_model.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+
+    index_name = st.text_input("Index name", "default", help="Letters, digits, '_' or '-' (up to 64). Indexes are stored on disk and reused across sessions.")
+    index_dtype = st.radio("Storage", ["float32", "int8"], horizontal=True, help="int8 uses 4x less disk and memory.")
+    try:
+        index = EmbeddingIndex(index_name, similarity_model.get_sentence_embedding_dimension(), index_dtype, EMBEDDING_MODEL_ID)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+    st.caption(f"📚 Index **{index_name}** holds {index.count:,} documents.")
+
+    corpus_file = st.file_uploader("Upload a CSV to add to the index", type=["csv"])
+    if corpus_file:
+        corpus_df = pd.read_csv(corpus_file)
+        text_column = st.selectbox("Text column", corpus_df.columns)
+        if st.button("Add to Index"):
+            progress_bar = st.progress(0.0, text="Encoding documents...")
+            with span("index_add"):
+                added = index.add(
+                    corpus_df[text_column].dropna().astype(str).tolist(), encode_texts,
+                    progress_callback=lambda done, total: progress_bar.progress(done / total, text=f"Encoded {done:,}/{total:,} new documents"),
+                )
+            st.success(f"✅ Added {added:,} new documents ({index.count:,} total).")
+
+    if index.count:
+        query_text = st.text_area("Find documents similar to:")
+        top_k = st.slider("Results", 1, 50, 10)
+        if st.button("Search") and query_text.strip():
+            with span("index_search"):
+                scores, rows = index.search(encode_texts([query_text.strip()]), k=top_k)
+            st.dataframe(pd.DataFrame({"Similarity": scores[0].round(3), "Document": index.documents(rows[0])}), hide_index=True)
+
+        duplicate_threshold = st.slider("Near-duplicate threshold", 0.80, 1.00, 0.95, 0.01)
+        if st.button("Find Near-Duplicates"):
+            progress_bar = st.progress(0.0, text="Comparing document blocks...")
+            with span("near_duplicates"):
+                clusters = index.near_duplicates(
+                    duplicate_threshold,
+                    progress_callback=lambda done, total: progress_bar.progress(done / total, text=f"Compared {done:,}/{total:,} blocks"),
+                )
+            st.write(f"Found **{len(clusters):,}** near-duplicate clusters.")
+            rows = [(cluster_id, row) for cluster_id, members in enumerate(clusters[:100], 1) for row in members]
+            if rows:
+                st.dataframe(pd.DataFrame({
+                    "Cluster": [cluster_id for cluster_id, _ in rows],
+                    "Document": index.documents([row for _, row in rows]),
+                }), hide_index=True)
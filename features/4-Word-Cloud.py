@@ -1,19 +1,66 @@
 import streamlit as st
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
+from features.csv_ingestion import csv_header
+from features.instrumentation import span
+from features.word_frequencies import (
+    MAX_LAYOUT_WORDS, count_csv_column, count_text, count_text_file, render_word_cloud,
+)
 
 st.title("Word Cloud Generator ☁️")
 st.write("Visualize the most frequent words in your text.")
 
-# Input text
-user_text = st.text_area("Enter text to generate a word cloud:")
+# Input source
+source = st.radio("Input Source", ["Enter Text", "Upload File"], horizontal=True)
+
+user_text, uploaded_file, text_column = "", None, None
+if source == "Enter Text":
+    user_text = st.text_area("Enter text to generate a word cloud:")
+else:
+    uploaded_file = st.file_uploader("Upload a TXT or CSV file", type=["txt", "csv"])
+    if uploaded_file is not None and uploaded_file.name.lower().endswith(".csv"):
+        # Only the header is read here; the column itself is streamed later
+        columns = csv_header(uploaded_file)
+        text_column = st.selectbox("Select the text column", columns)
+
+# Render options
+with st.expander("⚙️ Render Options"):
+    col1, col2 = st.columns(2)
+    with col1:
+        width = st.number_input("Width (px)", 200, 2000, 800, step=100)
+        background_color = st.selectbox("Background", ["white", "black"])
+    with col2:
+        height = st.number_input("Height (px)", 100, 1200, 400, step=100)
+        colormap = st.selectbox("Color Map", ["viridis", "plasma", "inferno", "cividis", "Set2", "Dark2"])
+    max_words = st.slider("Maximum words in the cloud", 50, MAX_LAYOUT_WORDS, 200, step=50)
 
 if st.button("Generate Word Cloud"):
-    if user_text:
-        wordcloud = WordCloud(width=800, height=400, background_color="white").generate(user_text)
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wordcloud, interpolation="bilinear")
-        plt.axis("off")
-        st.pyplot(plt)
+    if source == "Enter Text" and user_text:
+        with span("word_frequencies"):
+            frequencies = count_text(user_text)
+    elif source == "Upload File" and uploaded_file is not None:
+        progress_bar = st.progress(0, text="Counting words...")
+
+        def update_progress(done, total):
+            progress_bar.progress(min(done / max(total, 1), 1.0), text=f"Counting words... {done / 1e6:.1f} / {total / 1e6:.1f} MB")
+
+        uploaded_file.seek(0)
+        with span("word_frequencies"):
+            if text_column:
+                frequencies = count_csv_column(uploaded_file, text_column, progress_callback=update_progress)
+            else:
+                frequencies = count_text_file(uploaded_file, progress_callback=update_progress)
+        progress_bar.empty()
     else:
-        st.warning("Please enter some text to generate a word cloud.")
+        st.warning("Please enter some text or upload a file to generate a word cloud.")
+        st.stop()
+
+    if not frequencies:
+        st.warning("No words left to display after removing stop words.")
+        st.stop()
+
+    with span("render_word_cloud"):
+        png, from_cache = render_word_cloud(frequencies, width=int(width), height=int(height),
+                                            background_color=background_color, colormap=colormap, max_words=max_words)
+    st.image(png, use_container_width=True)
+    st.caption(f"{sum(frequencies.values()):,} words, {len(frequencies):,} distinct"
+               + (" · served from the render cache" if from_cache else ""))
+    st.download_button("Download PNG", png, file_name="word_cloud.png", mime="image/png")
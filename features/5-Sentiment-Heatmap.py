@@ -1,44 +1,31 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from transformers.pipelines import pipeline  
-import numpy as np
-import nltk
+from features.functions import load_model
+from features.resources import ensure_nltk_data
+from features.chart_rendering import BUCKETS, HEATMAP_TILE_WIDTH, heatmap_figure, heatmap_page_count, resample_trend, trend_figure
+from features.csv_ingestion import CSVChunkReader, missing_columns
+from features.instrumentation import span
+from features.inference import run_cached, signed_score
+from features.sentiment_lexicon import build_lexicon, load_lexicon, lookup_scores, score_unique_words
 import os
-from nltk.tokenize import sent_tokenize, word_tokenize
-
-# ✅ Correct NLTK tokenizer handling
-try:
-    nltk.data.find("tokenizers/punkt")
-except LookupError:
-    nltk.download("punkt")
 
 st.title("📊 Sentiment Heatmap & Trends")
 
-# ✅ Load sentiment model (cached for better performance)
-@st.cache_resource
+# ✅ Load sentiment model (shared process-wide via the model registry)
+@span("load_sentiment_model")
 def load_sentiment_model():
-    return pipeline("sentiment-analysis")
-
-sentiment_model = load_sentiment_model()
-
-# ✅ Function to get sentiment scores
-def get_sentiment_scores(text):
-    """Returns a sentiment score based on the input text."""
-    if not text.strip():
-        return 0  # Return neutral score if text is empty
-    
-    sentiment_result = sentiment_model(text)[0]
-    label = sentiment_result['label']
-    score = sentiment_result['score']
-    
-    if label == "POSITIVE":
-        return score  # Positive values
-    elif label == "NEGATIVE":
-        return -score  # Negative values
-    else:
-        return 0  # Neutral values
+    return load_model("sentiment")
+
+load_sentiment_model()  # Warm the shared model when the page opens
+
+# ✅ Function to get sentiment scores (batched, served from the inference cache)
+@span("get_sentiment_scores")
+def get_sentiment_scores(texts):
+    """Returns a sentiment score per input text (positive > 0, negative < 0)."""
+    texts = [str(text) for text in texts]
+    non_empty = [text for text in texts if text.strip()]
+    scores = iter([signed_score(result) for result in run_cached("sentiment", non_empty)])
+    return [next(scores) if text.strip() else 0 for text in texts]  # Neutral score for empty text
 
 # ✅ Heatmap color selection
 heatmap_colors = {
@@ -54,17 +41,13 @@ st.subheader("📂 Upload a CSV/Text file or enter text:")
 uploaded_file = st.file_uploader("Upload a `.txt` or `.csv` file", type=["txt", "csv"])
 
 user_text = ""
-df = None  # Initialize df to prevent reference errors
 
 if uploaded_file:
     if uploaded_file.name.endswith(".txt"):
         user_text = uploaded_file.read().decode("utf-8")
     elif uploaded_file.name.endswith(".csv"):
-        df = pd.read_csv(uploaded_file)
-
-        # ✅ Validate CSV columns
-        if "Date" in df.columns and "Text" in df.columns:
-            df = df.dropna(subset=["Text"])  # Remove empty rows
+        # ✅ Validate CSV columns (header only; rows are streamed when the heatmap is generated)
+        if not missing_columns(uploaded_file, ["Date", "Text"]):
             st.write("✅ CSV detected with Date & Text columns.")
         else:
             st.error("❌ CSV must contain 'Date' and 'Text' columns.")
@@ -72,49 +55,83 @@ if uploaded_file:
 else:
     user_text = st.text_area("✏️ Or enter text manually:", height=200)
 
+# ✅ Time buckets for the CSV trend chart
+bucket = st.radio("🕒 Trend Buckets:", list(BUCKETS), horizontal=True, help="Auto uses hours for spans up to 3 days, days beyond")
+
 # ✅ Select analysis level
 analysis_level = st.radio("🔍 Select Analysis Level:", ["Sentence-Level", "Word-Level"])
 
+# ✅ Word-level scoring: unique vocabulary through the model, or a precomputed lexicon lookup
+word_scoring = "Model"
+if analysis_level == "Word-Level":
+    word_scoring = st.radio("🔤 Word Scoring:", ["Model", "Lexicon"], horizontal=True,
+                            help="Lexicon mode looks words up in a per-word polarity table built once from the model.")
+    if word_scoring == "Lexicon" and load_lexicon() is None:
+        st.info("ℹ️ No polarity lexicon found yet. Build it once from the model's vocabulary (takes a few minutes).")
+        if st.button("🧱 Build Lexicon"):
+            lexicon_progress = st.progress(0.0, text="Scoring vocabulary...")
+            with span("build_lexicon"):
+                lexicon = build_lexicon(progress_callback=lambda done, total, _: lexicon_progress.progress(done / total, text=f"Scored {done:,}/{total:,} words"))
+            st.success(f"✅ Lexicon built with {len(lexicon):,} words.")
+
 if st.button("🚀 Generate Heatmap"):
+    st.session_state.pop("heatmap_scores", None)
     if uploaded_file and uploaded_file.name.endswith(".csv"):
-        # 📅 Sentiment Over Time
-        df["Sentiment Score"] = df["Text"].apply(get_sentiment_scores)
-        df["Date"] = pd.to_datetime(df["Date"])
-        df = df.sort_values("Date")
-
-        # ✅ Handle case where all text is empty
-        if df["Sentiment Score"].isnull().all():
+        # 📅 Sentiment Over Time (Date/Text chunks scored as they are read, empty rows skipped)
+        progress_bar = st.progress(0.0, text="Scoring rows...")
+        reader = CSVChunkReader(uploaded_file, ["Date", "Text"], date_column="Date", dropna=["Text"])
+        trend = []
+        for chunk in reader:
+            trend.append(pd.DataFrame({"Date": chunk["Date"], "Sentiment Score": get_sentiment_scores(chunk["Text"].tolist())}))
+            progress_bar.progress(reader.progress(), text=f"Scored {reader.rows:,} rows")
+        progress_bar.empty()
+        df = pd.concat(trend, ignore_index=True) if trend else pd.DataFrame(columns=["Date", "Sentiment Score"])
+        if reader.invalid_dates:
+            st.warning(f"⚠️ Skipped {reader.invalid_dates:,} rows with an unparseable Date.")
+
+        # ✅ Handle case where all text is empty or no date could be parsed
+        if df.empty or df["Sentiment Score"].isnull().all():
             st.error("❌ No valid text found in the CSV file for sentiment analysis.")
+        elif df["Date"].isna().all():
+            st.error("❌ The 'Date' column contains no valid dates.")
         else:
-            # Plot time-series sentiment
-            plt.figure(figsize=(10, 5))
-            plt.plot(df["Date"], df["Sentiment Score"], marker="o", linestyle="-", color="b")
-            plt.axhline(y=0, color="gray", linestyle="--")
-            plt.title("📅 Sentiment Trend Over Time")
-            plt.xlabel("Date")
-            plt.ylabel("Sentiment Score")
-            plt.xticks(rotation=45)
-            plt.grid()
-            st.pyplot(plt)
+            # Plot time-series sentiment (bucketed and downsampled)
+            with span("sentiment_trend_plot"):
+                buckets, freq = resample_trend(df, "Date", "Sentiment Score", freq=BUCKETS[bucket])
+                figure, points = trend_figure(buckets, freq, "📅 Sentiment Trend Over Time", "Sentiment Score", zero_line=True)
+                st.pyplot(figure)
+                st.caption(f"📉 {len(buckets):,} {'hourly' if freq == 'h' else 'daily'} buckets, {points:,} points plotted.")
 
     elif user_text.strip():
         # ✅ Process Sentences or Words
-        text_segments = sent_tokenize(user_text) if analysis_level == "Sentence-Level" else word_tokenize(user_text)
+        ensure_nltk_data("tokenizers/punkt_tab", "punkt_tab")  # NLTK is loaded only once text is analysed
+        from nltk.tokenize import sent_tokenize, word_tokenize
+        with span("tokenize_text"):
+            text_segments = sent_tokenize(user_text) if analysis_level == "Sentence-Level" else word_tokenize(user_text)
 
         if not text_segments:
             st.error("❌ No valid text entered for sentiment analysis.")
         else:
             # ✅ Get sentiment scores
-            sentiment_scores = [get_sentiment_scores(segment) for segment in text_segments]
+            if analysis_level == "Sentence-Level":
+                sentiment_scores = get_sentiment_scores(text_segments)
+            elif word_scoring == "Lexicon" and load_lexicon() is not None:
+                with span("lexicon_lookup"):
+                    sentiment_scores = lookup_scores(text_segments, load_lexicon())
+            else:
+                with span("score_unique_words"):
+                    sentiment_scores = score_unique_words(text_segments)  # Each distinct word scored once
 
-            # ✅ Normalize for heatmap
-            norm_scores = np.array(sentiment_scores).reshape(1, -1)
-
-            # ✅ Plot heatmap
-            plt.figure(figsize=(max(10, len(sentiment_scores) // 2), 1))
-            sns.heatmap(norm_scores, annot=True, fmt=".2f", cmap=heatmap_colors[selected_color], center=0, linewidths=1, xticklabels=False)
-            plt.title("📊 Sentiment Heatmap")
-            st.pyplot(plt)
+            st.session_state["heatmap_scores"] = sentiment_scores  # Kept so heatmap pages can be browsed
 
     else:
         st.warning("⚠️ Please upload a text file, CSV file, or enter text before generating the heatmap.")
+
+# ✅ Plot heatmap in fixed-width tiles, one page at a time (values annotated only on small pages)
+if st.session_state.get("heatmap_scores"):
+    sentiment_scores = st.session_state["heatmap_scores"]
+    pages = heatmap_page_count(len(sentiment_scores))
+    page = st.number_input(f"🗂️ Heatmap page (of {pages})", min_value=1, max_value=pages, value=1) - 1 if pages > 1 else 0
+    with span("sns.heatmap"):
+        st.pyplot(heatmap_figure(sentiment_scores, heatmap_colors[selected_color], page=page))
+    st.caption(f"📊 {len(sentiment_scores):,} scores, {HEATMAP_TILE_WIDTH} per row.")
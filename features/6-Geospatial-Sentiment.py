@@ -1,84 +1,101 @@
+import os
 import streamlit as st
 import pandas as pd
-import folium
-from folium.plugins import MarkerCluster
-from streamlit_folium import folium_static
-from transformers.pipelines import pipeline  
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
-import time
+from features.functions import load_model
+from features.csv_ingestion import CSVChunkReader, missing_columns
+from features.instrumentation import span
+from features.inference import run_cached, signed_score
+from features.geocoding import geocode_locations, import_gazetteer, imported_gazetteer_path, reset_gazetteer
+from features.map_rendering import ROW_MARKER_LIMIT, build_sentiment_map
 
 st.title("📍 Geospatial Sentiment Mapping")
 
-# ✅ Load Sentiment Model (Cached)
-@st.cache_resource
+# ✅ Load Sentiment Model (shared process-wide via the model registry)
+@span("load_sentiment_model")
 def load_sentiment_model():
-    return pipeline("sentiment-analysis")
-
-sentiment_model = load_sentiment_model()
-
-# ✅ Function to Get Sentiment Scores
-def get_sentiment_scores(text):
-    """Returns sentiment score from text."""
-    sentiment_result = sentiment_model(text)[0]
-    label = sentiment_result['label']
-    score = sentiment_result['score']
-    
-    return score if label == "POSITIVE" else -score if label == "NEGATIVE" else 0
-
-# ✅ Convert Location to Latitude & Longitude
-geolocator = Nominatim(user_agent="geo-sentiment")
-
-@st.cache_data
-def get_lat_lon(location):
-    """Fetches latitude & longitude for a given location."""
-    try:
-        time.sleep(1)  # Prevents API rate limit errors
-        location_data = geolocator.geocode(location, timeout=10)
-        return (location_data.latitude, location_data.longitude) if location_data else (None, None)
-    except GeocoderTimedOut:
-        return (None, None)
+    return load_model("sentiment")
+
+load_sentiment_model()  # Warm the shared model when the page opens
+
+# ✅ Function to Get Sentiment Scores (batched, served from the inference cache)
+@span("get_sentiment_scores")
+def get_sentiment_scores(texts):
+    """Returns a sentiment score per input text."""
+    return [signed_score(result) for result in run_cached("sentiment", texts)]
+
+# ✅ Convert Locations to Latitude & Longitude (offline gazetteer + persistent cache, Nominatim fallback)
+@span("get_lat_lon")
+def get_lat_lon(locations, use_fallback=True):
+    """Fetches latitude & longitude for each distinct location."""
+    progress_bar = st.empty()
+
+    def report(done, total):
+        progress_bar.progress(done / total, text=f"🌐 Online lookup for unknown places: {done}/{total}")
+
+    coordinates = geocode_locations(locations, use_fallback=use_fallback, progress_callback=report)
+    progress_bar.empty()
+    return coordinates
+
+# ✅ Optional: import a full GeoNames dump (e.g. cities15000.txt) for wider offline coverage
+with st.expander("🗺️ Gazetteer Settings"):
+    use_fallback = st.checkbox("Use Nominatim for places missing from the gazetteer", value=True,
+                               help="Online lookups are rate-limited to one per second.")
+    gazetteer_file = st.file_uploader("Import a GeoNames TSV", type=["txt", "tsv"])
+    st.caption("An imported gazetteer replaces the bundled one and is kept across restarts until removed.")
+    if gazetteer_file and st.button("Import Gazetteer"):
+        st.success(f"✅ Indexed {import_gazetteer(gazetteer_file):,} place names.")
+    if os.path.exists(imported_gazetteer_path()) and st.button("Remove Imported Gazetteer"):
+        reset_gazetteer()
+        st.success("✅ Using the bundled gazetteer again.")
+
+# ✅ Map Rendering Options (large uploads are aggregated before anything is sent to the browser)
+with st.expander("🧭 Map Rendering"):
+    aggregation_mode = st.radio("Aggregate by", ["Location", "Grid"], horizontal=True)
+    cell_degrees = st.slider("Grid cell size (degrees)", 0.1, 10.0, 1.0, 0.1, disabled=aggregation_mode != "Grid")
+    show_row_cluster = st.checkbox("Show row-level cluster layer when zoomed in", value=True)
+    row_marker_limit = st.number_input("Individual markers up to (rows)", min_value=0, value=ROW_MARKER_LIMIT, step=100)
 
 # ✅ File Upload Section
 st.subheader("📂 Upload a CSV File with 'Location' & 'Text' Columns")
 uploaded_file = st.file_uploader("Upload CSV", type=["csv"])
 
 if uploaded_file:
-    df = pd.read_csv(uploaded_file)
-
-    # ✅ Validate CSV Columns
-    if "Location" in df.columns and "Text" in df.columns:
-        df = df.dropna(subset=["Location", "Text"])  # Remove Empty Rows
+    # ✅ Validate CSV Columns (header only, before any row is read)
+    if not missing_columns(uploaded_file, ["Location", "Text"]):
         st.write("✅ CSV Detected with Location & Text Columns.")
 
-        # ✅ Perform Sentiment Analysis
-        df["Sentiment Score"] = df["Text"].apply(get_sentiment_scores)
+        # ✅ Perform Sentiment Analysis chunk by chunk (only Location & Text are read; empty rows skipped)
+        progress_bar = st.progress(0.0, text="Scoring rows...")
+        reader = CSVChunkReader(uploaded_file, ["Location", "Text"], dropna=["Location", "Text"])
+        scored = []
+        for chunk in reader:
+            scored.append(pd.DataFrame({"Location": chunk["Location"], "Sentiment Score": get_sentiment_scores(chunk["Text"].tolist())}))
+            progress_bar.progress(reader.progress(), text=f"Scored {reader.rows:,} rows")
+        progress_bar.empty()
+        df = pd.concat(scored, ignore_index=True) if scored else pd.DataFrame(columns=["Location", "Sentiment Score"])
 
-        # ✅ Get Latitude & Longitude for Each Location
-        df["Coordinates"] = df["Location"].apply(lambda loc: get_lat_lon(loc))
+        # ✅ Get Latitude & Longitude (each distinct location resolved once)
+        coordinates = get_lat_lon(df["Location"].tolist(), use_fallback=use_fallback)
+        df["Coordinates"] = df["Location"].map(coordinates)
 
         # ✅ Filter Out Locations That Failed Geocoding
-        df = df[df["Coordinates"].notnull()]
-
-        # ✅ Create Map
-        sentiment_map = folium.Map(location=[20, 0], zoom_start=2)
-
-        # ✅ Add Marker Clusters
-        marker_cluster = MarkerCluster().add_to(sentiment_map)
-
-        for _, row in df.iterrows():
-            lat, lon = row["Coordinates"]
-            sentiment = row["Sentiment Score"]
-            color = "green" if sentiment > 0 else "red" if sentiment < 0 else "orange"
+        df = df[df["Coordinates"].map(lambda coords: coords[0] is not None)]
 
-            folium.Marker(
-                location=[lat, lon],
-                popup=f"{row['Location']}\nSentiment Score: {sentiment:.2f}",
-                icon=folium.Icon(color=color),
-            ).add_to(marker_cluster)
+        # ✅ Create Map (row markers for small uploads, aggregated points for large ones)
+        with span("build_sentiment_map"):
+            sentiment_map, rendered_points, detail_points = build_sentiment_map(
+                df, mode=aggregation_mode, cell_degrees=cell_degrees,
+                show_row_cluster=show_row_cluster, row_marker_limit=row_marker_limit,
+            )
 
         # ✅ Display Map
-        folium_static(sentiment_map)
+        st.caption(
+            f"🗺️ Rendered **{rendered_points:,}** map points for **{len(df):,}** rows"
+            + (f" (+ {detail_points:,} rows in the zoom-in cluster layer)" if detail_points else "")
+        )
+        with span("folium_static"):
+            from streamlit_folium import folium_static
+            folium_static(sentiment_map)
 
     else:
         st.error("❌ CSV must contain 'Location' and 'Text' columns.")
@@ -5,9 +5,12 @@ import plotly.express as px
 import os
 import time
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
 from streamlit_autorefresh import st_autorefresh  # ✅ Import for proper auto-refresh
+from features.hf_inference import InferenceClient, top_label
+from features.keyword_rules import get_keyword_engine, rule_labels
+from features.forecasting import HOLT_MODEL, SentimentForecaster, daily_counts
+from features import news_store
+from features.instrumentation import span
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,48 +21,73 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_CSE_ID = os.getenv("GOOGLE_CSE_ID")
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 
-# ✅ Improved Sentiment Analysis Function
-def get_sentiment(text):
-    """Uses Hugging Face API + custom rule-based sentiment for IT news."""
-    if not text or len(text) < 10:  
-        return "Neutral"
-
-    # Rule-Based Sentiment Boosting for IT Topics
-    text_lower = text.lower()
-    negative_keywords = ["vulnerability", "ransomware", "attack", "breach", "hacked", "phishing"]
-    positive_keywords = ["secured", "patched", "protected", "encrypted", "defended", "firewall"]
-
-    if any(word in text_lower for word in negative_keywords):
-        return "NEGATIVE"
-    if any(word in text_lower for word in positive_keywords):
-        return "POSITIVE"
-
-    # AI-Based Sentiment Analysis
-    url = "https://api-inference.huggingface.co/models/SamLowe/roberta-base-go_emotions"
-    headers = {"Authorization": f"Bearer {HUGGING_FACE_API_KEY}"}
-    payload = {"inputs": text}
-
-    response = requests.post(url, headers=headers, json=payload)
-
-    if response.status_code == 200:
-        try:
-            sentiments = response.json()
-            if isinstance(sentiments, list) and len(sentiments) > 0:
-                return max(sentiments[0], key=lambda x: x["score"])["label"]
-        except KeyError:
-            return "Neutral"
-    return "Neutral"
+EMOTION_API_MODEL = "SamLowe/roberta-base-go_emotions"
+
+# ✅ One pooled, batching API client per server process (results cached per text)
+@st.cache_resource
+def get_inference_client():
+    return InferenceClient(EMOTION_API_MODEL, api_key=HUGGING_FACE_API_KEY)
+
+# ✅ Improved Sentiment Analysis Function (whole column at once)
+@span("get_sentiments")
+def get_sentiments(texts):
+    """Uses Hugging Face API + custom rule-based sentiment for IT news.
+
+    Returns the labels and the lexicon terms matched in each text.
+    """
+    # Rule-Based Sentiment Boosting for IT Topics (lexicons in data/lexicons, one vectorized pass)
+    rules = get_keyword_engine().match(texts)
+    labels = rule_labels(rules["Rule Score"])
+
+    undecided = {}
+    for i, text in enumerate(texts):
+        if not isinstance(text, str) or len(text) < 10:
+            labels[i] = "Neutral"
+        elif labels[i] is None:
+            undecided[i] = text
+
+    # AI-Based Sentiment Analysis: batched, concurrent requests for the undecided texts only
+    if undecided:
+        outputs = get_inference_client().classify(list(undecided.values()))
+        for i, output in zip(undecided, outputs):
+            labels[i] = top_label(output)
+    return labels, rules["Matched Terms"].tolist()
 
 # Function to fetch news articles using News API
-def fetch_news(query):
-    """Fetches news articles from NewsAPI."""
-    url = f"https://newsapi.org/v2/everything?q={query}&sortBy=publishedAt&apiKey={NEWS_API_KEY}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json().get("articles", [])
-    return []
+NEWS_PAGE_SIZE = 100  # NewsAPI maximum per request
+
+@span("fetch_news")
+def fetch_news(query, since=None):
+    """Fetches news articles from NewsAPI, optionally only those published at or after `since`.
+
+    With `since`, pages are requested until they reach `since`, the reported total is
+    exhausted, or NewsAPI refuses further pages. Returns (articles, complete): `complete`
+    is False when a request failed partway, so callers must not store a partial fetch
+    (storing the newest articles would move the high-water mark past the missing ones).
+    """
+    params = {"q": query, "sortBy": "publishedAt", "pageSize": NEWS_PAGE_SIZE, "apiKey": NEWS_API_KEY}
+    if since:
+        params["from"] = since  # Inclusive; articles already stored are dropped by the store
+    articles, page = [], 1
+    while True:
+        response = requests.get("https://newsapi.org/v2/everything", params={**params, "page": page}, timeout=30)
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = {}
+        if response.status_code != 200:
+            if payload.get("code") == "maximumResultsReached":  # Plan limit: nothing more can be fetched
+                return articles, True
+            return articles, False
+        batch = payload.get("articles", [])
+        articles.extend(batch)
+        if not since or len(batch) < NEWS_PAGE_SIZE or len(articles) >= payload.get("totalResults", 0) \
+                or min(article.get("publishedAt") or since for article in batch) <= since:
+            return articles, True
+        page += 1
 
 # Function to fetch web search results using Google Custom Search API
+@span("fetch_web_results")
 def fetch_web_results(query):
     """Fetches search results from Google Custom Search API."""
     url = f"https://www.googleapis.com/customsearch/v1?q={query}&key={GOOGLE_API_KEY}&cx={GOOGLE_CSE_ID}"
@@ -69,80 +97,108 @@ def fetch_web_results(query):
     return []
 
 # Function to analyze sentiment for news articles
-def analyze_news_sentiment(articles):
-    """Performs sentiment analysis on news articles using both title & description."""
-    df = pd.DataFrame(articles)
+def analyze_news_sentiment(query, articles):
+    """Scores only articles not yet stored for this query using both title & description.
 
-    if "publishedAt" not in df.columns:
+    Returns the accumulated store for the query and the number of newly scored articles.
+    """
+    if articles and not any(article.get("publishedAt") for article in articles):
         st.error("Error: 'publishedAt' column missing in API response.")
-        return pd.DataFrame()  # Return empty DataFrame
+        return pd.DataFrame(), 0
 
-    # Convert and rename columns
-    df.rename(columns={"publishedAt": "Published At", "title": "Title", "description": "Description", "url": "URL"}, inplace=True)
-    df["Published At"] = pd.to_datetime(df["Published At"]).dt.date  # Convert to date format
+    new_articles = news_store.unseen_articles(query, articles)
+    if new_articles:
+        # Apply sentiment analysis to title + description (if available)
+        texts = [f"{article.get('title')} {article['description']}" if article.get("description") else article.get("title")
+                 for article in new_articles]
+        sentiments, matched_terms = get_sentiments(texts)
+        news_store.add_articles(query, new_articles, sentiments, matched_terms)
 
-    # Apply sentiment analysis to title + description (if available)
-    df["Sentiment"] = df.apply(lambda row: get_sentiment(f"{row['Title']} {row['Description']}" if pd.notnull(row["Description"]) else row["Title"]), axis=1)
+    return news_store.load_articles(query), len(new_articles)
 
-    return df[["Title", "Description", "Sentiment", "Published At", "URL"]]
-
-
-# Function to perform trend forecasting
-def forecast_trends(sentiment_df):
-    """Uses Exponential Smoothing for forecasting sentiment trends."""
-    if sentiment_df.empty:
-        return pd.DataFrame()
+# ✅ Incremental ingestion: fetch only articles newer than the stored high-water mark
+def refresh_news(query):
+    """Fetches and scores new articles for a query; returns the accumulated DataFrame."""
+    articles, complete = fetch_news(query, since=news_store.high_water_mark(query))
+    if not complete:
+        st.warning("⚠️ NewsAPI returned an error partway through this refresh; new articles will be fetched on the next one.")
+        articles = []  # Keep the high-water mark where it is so no article is skipped
+    return analyze_news_sentiment(query, articles)
 
-    sentiment_df["Published At"] = pd.to_datetime(sentiment_df["Published At"])
-    trend_data = sentiment_df.groupby(["Published At", "Sentiment"]).size().reset_index(name="count")
 
-    forecast_results = []
-    for sentiment in trend_data["Sentiment"].unique():
-        temp_df = trend_data[trend_data["Sentiment"] == sentiment]
-        if len(temp_df) < 3:  # Need at least 3 data points
-            continue
+# ✅ Fitted forecasting state per query, kept across button presses and auto-refreshes
+@st.cache_resource
+def get_forecaster(query):
+    return SentimentForecaster()
 
-        # Fit model
-        model = ExponentialSmoothing(temp_df["count"], trend="add", seasonal=None)
-        fit = model.fit()
-        future_dates = [temp_df["Published At"].max() + timedelta(days=i) for i in range(1, 6)]
-        predictions = fit.forecast(5)
-
-        # Store results
-        for date, pred in zip(future_dates, predictions):
-            forecast_results.append({"Date": date, "Sentiment": sentiment, "Count": pred})
-
-    return pd.DataFrame(forecast_results)
+# Function to perform trend forecasting
+@span("forecast_trends")
+def forecast_trends(sentiment_df, query):
+    """Uses Holt's exponential smoothing (additive trend) for forecasting sentiment trends.
+
+    All label series are fitted together; on later calls only newly completed days
+    are folded into the stored state instead of refitting. Returns forecasts and timings.
+    """
+    counts = daily_counts(sentiment_df)
+    if counts.empty:
+        return pd.DataFrame(), {}
+
+    forecaster = get_forecaster(query)
+    timings = forecaster.update(counts)
+    start = time.perf_counter()
+    forecast_df = forecaster.forecast(counts, horizon=5)
+    timings["Forecast Seconds"] = time.perf_counter() - start
+    return forecast_df, timings
 
 # Streamlit UI
 st.title("📊 Social Media Sentiment Tracking & Forecasting Dashboard")
 
+# ✅ Fixed Auto-Refresh (No Infinite Loop)
+st.sidebar.header("🔄 Auto-Refresh")
+refresh = st.sidebar.checkbox("Enable Auto-Refresh")  # Toggle auto-refresh
+update_interval = st.sidebar.slider("Update Interval (seconds)", 10, 300, 60)  # Refresh rate
+
 # User input for keyword search
 query = st.text_input("Enter a topic or keyword to analyze:", "Artificial Intelligence")
 
-# Fetch & analyze news on button click
+# Fetch & analyze news on button click, and on every auto-refresh once a query has been analyzed
 if st.button("Analyze Sentiment"):
+    st.session_state["active_query"] = query
+run_analysis = st.session_state.get("active_query") == query
+
+if run_analysis:
     with st.spinner("Fetching news and analyzing sentiment..."):
-        articles = fetch_news(query)
-        sentiment_df = analyze_news_sentiment(articles)
+        sentiment_df, new_count = refresh_news(query)
 
         if not sentiment_df.empty:
             st.subheader("📊 Sentiment Analysis of News Articles")
+            st.caption(f"🗂️ {len(sentiment_df):,} stored articles for this query ({new_count:,} new this refresh)")
             
             # Pie chart for sentiment distribution
-            fig = px.pie(sentiment_df, names="Sentiment", title="News Sentiment Distribution")
-            st.plotly_chart(fig)
+            with span("sentiment_pie_chart"):
+                fig = px.pie(sentiment_df, names="Sentiment", title="News Sentiment Distribution")
+                st.plotly_chart(fig)
 
             # Display table
             st.dataframe(sentiment_df)
 
             # Trend Forecasting
-            forecast_df = forecast_trends(sentiment_df)
+            forecast_df, forecast_timings = forecast_trends(sentiment_df, query)
             if not forecast_df.empty:
                 st.subheader("🔮 Sentiment Trend Forecasting")
-                fig_forecast = px.line(forecast_df, x="Date", y="Count", color="Sentiment",
-                                       title="Sentiment Forecast Over Next 5 Days")
-                st.plotly_chart(fig_forecast)
+                with span("forecast_chart"):
+                    fig_forecast = px.line(forecast_df, x="Date", y="Count", color="Sentiment",
+                                           title="Sentiment Forecast Over Next 5 Days")
+                    st.plotly_chart(fig_forecast)
+                simpler = forecast_df[forecast_df["Model"] != HOLT_MODEL].drop_duplicates("Sentiment")
+                if not simpler.empty:
+                    st.caption("ℹ️ Short history, simpler forecast: " + ", ".join(
+                        f"{row.Sentiment} ({row.Model})" for row in simpler.itertuples()))
+                st.caption(
+                    f"⏱️ Refit {forecast_timings['Refit Series']} series in {forecast_timings['Fit Seconds'] * 1000:.1f} ms, "
+                    f"updated {forecast_timings['Updated Series']} incrementally in {forecast_timings['Update Seconds'] * 1000:.1f} ms, "
+                    f"forecast in {forecast_timings['Forecast Seconds'] * 1000:.1f} ms"
+                )
 
         # Web Search Results
         web_results = fetch_web_results(query)
@@ -150,11 +206,6 @@ if st.button("Analyze Sentiment"):
             st.subheader("🔍 Web Search Results")
             for result in web_results[:5]:
                 st.markdown(f"🔗 [{result['title']}]({result['link']})")
-                
-# ✅ Fixed Auto-Refresh (No Infinite Loop)
-st.sidebar.header("🔄 Auto-Refresh")
-refresh = st.sidebar.checkbox("Enable Auto-Refresh")  # Toggle auto-refresh
-update_interval = st.sidebar.slider("Update Interval (seconds)", 10, 300, 60)  # Refresh rate
 
 # ✅ Use `st_autorefresh()` Instead of `time.sleep()`
 if refresh:
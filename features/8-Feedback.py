@@ -1,25 +1,6 @@
 import streamlit as st
-import pandas as pd
-import os
-
-# ✅ CSV File Path
-FEEDBACK_FILE = "feedback_data.csv"
-
-# ✅ Function to Save Feedback to CSV
-def save_feedback(data):
-    # Convert single dictionary data into a DataFrame
-    new_data = pd.DataFrame([data])
-
-    # Check if the CSV file exists
-    if os.path.exists(FEEDBACK_FILE):
-        df = pd.read_csv(FEEDBACK_FILE)
-
-        # ✅ Use `pd.concat()` Instead of `df.append()`
-        df = pd.concat([df, new_data], ignore_index=True)
-    else:
-        df = new_data  # If no file exists, start with new data
-
-    df.to_csv(FEEDBACK_FILE, index=False)
+from features.feedback_store import save_feedback  # ✅ Append-only SQLite store (imports feedback_data.csv once)
+from features.instrumentation import span
 
 # ✅ Streamlit UI
 st.header("📝 Feedback", divider='rainbow')
@@ -48,5 +29,6 @@ if submit:
             "General Feedback": general_feedback
         }
 
-        save_feedback(feedback_data)  # ✅ Save to CSV
+        with span("save_feedback"):
+            save_feedback(feedback_data)  # ✅ Append to the feedback store
         st.success("✅ Thank you for your feedback! Your response has been saved.")
@@ -1,34 +1,15 @@
 import streamlit as st
-import yaml
-from yaml.loader import SafeLoader
 import streamlit_authenticator as stauth
-import os
-
-# Define config file
-CONFIG_FILE = "config.yaml"
-if not os.path.exists(CONFIG_FILE):
-    with open(CONFIG_FILE, "w") as file:
-        yaml.dump({"credentials": {"usernames": {}}}, file)
-
-# Load config file safely
-with open(CONFIG_FILE, "r", encoding="utf-8") as file:
-    config = yaml.load(file, Loader=SafeLoader)
-
-# Ensure config structure
-if config is None:
-    config = {"credentials": {"usernames": {}}}
-elif "credentials" not in config:
-    config["credentials"] = {"usernames": {}}
-elif "usernames" not in config["credentials"]:
-    config["credentials"]["usernames"] = {}
+from features.user_store import cookie_config, load_credentials
 
 # ✅ Fix: Ensure unique keys for authentication
 def show_login_form():
+    cookie = cookie_config()
     authenticator = stauth.Authenticate(
-        config["credentials"],
-        config.get("cookie", {}).get("name", "auth_cookie"),  # Unique Cookie Name
-        config.get("cookie", {}).get("key", "random_key_123"),  # Unique Key
-        config.get("cookie", {}).get("expiry_days", 30),
+        load_credentials(),  # ✅ From the user store; only users added since the last call are read
+        cookie.get("name", "auth_cookie"),  # Unique Cookie Name
+        cookie.get("key", "random_key_123"),  # Unique Key
+        cookie.get("expiry_days", 30),
     )
 
     authenticator.login()
@@ -1,28 +1,5 @@
 import streamlit as st
-import yaml
-from yaml.loader import SafeLoader
-import streamlit_authenticator as stauth
-import os
-
-# Define config file
-CONFIG_FILE = "config.yaml"
-
-# Ensure config file exists and is properly initialized
-if not os.path.exists(CONFIG_FILE):
-    with open(CONFIG_FILE, "w") as file:
-        yaml.dump({"credentials": {"usernames": {}}}, file)
-
-# Load config file safely
-with open(CONFIG_FILE, "r", encoding="utf-8") as file:
-    config = yaml.load(file, Loader=SafeLoader)
-
-# Ensure `config` has the correct structure
-if config is None:
-    config = {"credentials": {"usernames": {}}}
-elif "credentials" not in config:
-    config["credentials"] = {"usernames": {}}
-elif "usernames" not in config["credentials"]:
-    config["credentials"]["usernames"] = {}
+from features.user_store import add_user, hash_password, user_exists
 
 def show_register_form():
     with st.container():
@@ -35,30 +12,19 @@ def show_register_form():
 
         if st.button("Submit Registration"):
             if new_username and new_password and new_email:
-                # Ensure the config structure is correct
-                if "credentials" not in config:
-                    config["credentials"] = {}
-                if "usernames" not in config["credentials"]:
-                    config["credentials"]["usernames"] = {}
-
-                # Check if username already exists
-                if new_username in config["credentials"]["usernames"]:
+                # Check if username already exists (indexed lookup)
+                if user_exists(new_username):
                     st.error("Username already exists. Please choose a different one.")
                     return
 
-                # Hash the password
-                hashed_password = stauth.Hasher().hash(new_password)
-
-                # Store user data
-                config["credentials"]["usernames"][new_username] = {
-                    "name": new_name,
-                    "password": hashed_password,
-                    "email": new_email,
-                }
+                # Hash the password on a worker thread (bcrypt is deliberately slow)
+                with st.spinner("Creating your account..."):
+                    hashed_password = hash_password(new_password).result()
 
-                # Save updated config to file
-                with open(CONFIG_FILE, "w") as file:
-                    yaml.dump(config, file)
+                # Store user data atomically; a concurrent registration of the same name loses cleanly
+                if not add_user(new_username, new_name, new_email, hashed_password):
+                    st.error("Username already exists. Please choose a different one.")
+                    return
 
                 st.success("User registered successfully! You can now log in.")
 
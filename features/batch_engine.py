@@ -0,0 +1,234 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from features.inference import DEFAULT_BATCH_SIZE, run_batched, run_cached, signed_score
+from features.model_registry import get_model
+
+# ✅ Headless analyses shared with the pages: each takes a chunk of rows and returns it with result columns
+CHUNK_ROWS = 10_000
+SUMMARY_PARAMS = {"max_length": 50, "min_length": 25, "do_sample": False}  # Same as the Text Analysis page
+
+
+def _infer(model_name, texts, options):
+    if options.get("use_cache", True):
+        return run_cached(model_name, texts, batch_size=options.get("batch_size", DEFAULT_BATCH_SIZE))
+    return run_batched(get_model(model_name), texts, batch_size=options.get("batch_size", DEFAULT_BATCH_SIZE))
+
+
+def _texts(chunk, options):
+    return chunk[options["text_column"]].fillna("").astype(str).tolist()
+
+
+def analyze_sentiment(chunk, options):
+    """Adds "Sentiment" (label) and "Sentiment Score" (positive > 0, negative < 0)."""
+    results = _infer("sentiment", _texts(chunk, options), options)
+    return chunk.assign(**{
+        "Sentiment": [result["label"] for result in results],
+        "Sentiment Score": [signed_score(result) for result in results],
+    })
+
+
+def analyze_emotion(chunk, options):
+    """Adds the top "Emotion" label and its "Emotion Score"."""
+    results = _infer("emotion", _texts(chunk, options), options)
+    return chunk.assign(**{
+        "Emotion": [result["label"] for result in results],
+        "Emotion Score": [result["score"] for result in results],
+    })
+
+
+def analyze_keyphrases(chunk, options):
+    """Adds "Key Phrases" ("; "-separated), extracted KeyBERT-style with the shared MiniLM."""
+    from features.keyphrase_corpus import extract_corpus_keyphrases
+    from features.model_registry import EMBEDDING_MODEL_ID
+
+    embedding_model = get_model("embedding")
+
+    def encode_texts(texts):
+        return embedding_model.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+
+    keyphrases = extract_corpus_keyphrases(_texts(chunk, options), encode_texts, EMBEDDING_MODEL_ID,
+                                           top_n=options.get("top_n", 5))
+    return chunk.assign(**{"Key Phrases": ["; ".join(phrase for phrase, _ in phrases) for phrases in keyphrases]})
+
+
+def analyze_summary(chunk, options):
+    """Adds a "Summary" per row (map-reduce summarization for long documents)."""
+    from features.summarization import summarize_long
+
+    summaries = [summarize_long(text, SUMMARY_PARAMS, batch_size=options.get("batch_size", 4)) if text.strip() else ""
+                 for text in _texts(chunk, options)]
+    return chunk.assign(Summary=summaries)
+
+
+def analyze_geocode(chunk, options):
+    """Adds "Latitude" and "Longitude" for the location column (gazetteer + cache, optional Nominatim)."""
+    from features.geocoding import geocode_locations
+
+    locations = chunk[options["location_column"]].fillna("").astype(str).tolist()
+    coordinates = geocode_locations(locations, use_fallback=options.get("geocode_fallback", False))
+    return chunk.assign(  # float, so chunks without any match still write NaN rather than null-typed columns
+        Latitude=pd.Series([coordinates[location][0] for location in locations], index=chunk.index, dtype=float),
+        Longitude=pd.Series([coordinates[location][1] for location in locations], index=chunk.index, dtype=float),
+    )
+
+
+ANALYSES = {
+    "sentiment": analyze_sentiment,
+    "emotion": analyze_emotion,
+    "keyphrases": analyze_keyphrases,
+    "summary": analyze_summary,
+    "geocode": analyze_geocode,
+    "forecast": analyze_sentiment,  # Rows are scored per chunk, then aggregated into daily counts
+}
+
+
+def iter_input_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Streams a CSV or JSON Lines file (optionally compressed) as DataFrame chunks.
+
+    Every input column is read as text, so passthrough columns keep one type across
+    chunks (type inference per chunk would e.g. make a column numeric in one chunk and
+    text in the next, which a Parquet output cannot hold).
+    """
+    name = path.lower()
+    for suffix in (".gz", ".bz2", ".zip", ".xz", ".zst"):
+        name = name.removesuffix(suffix)
+    if name.endswith(".csv"):
+        return pd.read_csv(path, chunksize=chunk_rows, dtype=str)
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return (chunk.astype("string") for chunk in pd.read_json(path, lines=True, chunksize=chunk_rows, dtype=False))
+    raise ValueError(f"Unsupported input format: {path} (expected .csv or .jsonl)")
+
+
+class ChunkWriter:
+    """Appends DataFrame chunks to a CSV or Parquet file; the first chunk fixes the columns."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._parquet = path.lower().endswith(".parquet")
+        self._writer = None
+        self._schema = None
+        if not self._parquet and not path.lower().endswith(".csv"):
+            raise ValueError(f"Unsupported output format: {path} (expected .csv or .parquet)")
+
+    def write(self, chunk):
+        if self._parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._writer is None:
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                # Columns that are all-null in the first chunk would otherwise be typed as null forever
+                self._schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                          for field in schema])
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            # Text columns (incl. those typed from an all-null first chunk) take later values as strings
+            text_columns = [field.name for field in self._schema if pa.types.is_string(field.type)]
+            chunk = chunk.assign(**{column: chunk[column].astype("string") for column in text_columns})
+            self._writer.write_table(pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False))
+        else:
+            chunk.to_csv(self.path, mode="a" if self.rows else "w", header=not self.rows, index=False)
+        self.rows += len(chunk)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _init_worker(torch_threads):
+    """Pins each worker to `torch_threads` intra-op threads so workers x threads <= cores."""
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(torch_threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(torch_threads)
+
+
+def _process_chunk(analysis, chunk, options):
+    return ANALYSES[analysis](chunk, options)
+
+
+def _map_chunks(analysis, chunks, options, workers, torch_threads):
+    """Yields processed chunks in input order, keeping at most 2 x workers chunks in flight."""
+    if workers <= 0:
+        _init_worker(torch_threads)
+        for chunk in chunks:
+            yield _process_chunk(analysis, chunk, options)
+        return
+
+    # Spawned workers start clean: one copy of each model per worker, no inherited torch thread pools
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(torch_threads,)) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(_process_chunk, analysis, chunk, options))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def default_workers(torch_threads=1):
+    """One worker per `torch_threads` cores."""
+    return max(1, (os.cpu_count() or 1) // max(1, torch_threads))
+
+
+def run_analysis(analysis, input_path, output_path, text_column="Text", chunk_rows=CHUNK_ROWS, workers=None,
+                 torch_threads=1, progress_callback=None, **options):
+    """Streams `input_path` through an analysis and writes the results to `output_path`.
+
+    Every analysis except "forecast" writes the input rows plus its result columns.
+    "forecast" scores sentiment per chunk, accumulates daily counts per label
+    (`date_column` option) and writes a `horizon`-day forecast. `progress_callback`
+    is called as `(rows_done, elapsed_seconds)` after every chunk. Returns rows read.
+    """
+    if analysis not in ANALYSES:
+        raise KeyError(f"Unknown analysis '{analysis}'. Available: {', '.join(ANALYSES)}")
+    if analysis == "geocode":
+        options.setdefault("location_column", "Location")
+        if options.get("geocode_fallback"):
+            workers = 1  # Nominatim allows one request per second per client
+    options["text_column"] = text_column
+    workers = default_workers(torch_threads) if workers is None else workers
+
+    start = time.perf_counter()
+    rows = 0
+    counts = None
+    writer = ChunkWriter(output_path)
+    try:
+        for chunk in _map_chunks(analysis, iter_input_chunks(input_path, chunk_rows), options, workers, torch_threads):
+            rows += len(chunk)
+            if analysis == "forecast":
+                from features.forecasting import daily_counts
+                chunk_counts = daily_counts(chunk, date_column=options.get("date_column", "Date"), label_column="Sentiment")
+                counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+            else:
+                writer.write(chunk)
+            if progress_callback:
+                progress_callback(rows, time.perf_counter() - start)
+
+        if analysis == "forecast":
+            writer.write(forecast_counts(counts, horizon=options.get("horizon", 5)))
+    finally:
+        writer.close()
+    return rows
+
+
+def forecast_counts(counts, horizon=5):
+    """Forecasts daily label counts accumulated over all chunks (Holt's linear trend per label)."""
+    from features.forecasting import SentimentForecaster
+
+    if counts is None or counts.empty:
+        return pd.DataFrame(columns=["Date", "Sentiment", "Count", "Model"])
+    counts = counts.reindex(pd.date_range(counts.index.min(), counts.index.max(), freq="D")).fillna(0)
+    forecaster = SentimentForecaster()
+    forecaster.update(counts)
+    return forecaster.forecast(counts, horizon=horizon)
@@ -0,0 +1,137 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# ✅ Charts are drawn from aggregated, downsampled data so render time and image size stay flat as uploads grow
+MAX_PLOT_POINTS = 1_000  # Point budget per plotted line (LTTB downsampling above this)
+MARKER_POINTS = 60  # Lines with at most this many points also get markers
+AUTO_HOURLY_SPAN = pd.Timedelta(days=3)  # "Auto" buckets by hour up to this span, by day beyond it
+ROLLING_BUCKETS = 7  # Window of the rolling average, in buckets
+BUCKETS = {"Auto": "auto", "Hour": "h", "Day": "D"}
+
+HEATMAP_TILE_WIDTH = 50  # Cells per heatmap row
+HEATMAP_PAGE_ROWS = 20  # Rows per heatmap figure
+ANNOTATE_MAX_CELLS = 200  # Cell values are printed only on figures up to this size
+
+
+def resample_trend(df, date_column, value_column, freq="auto", rolling_buckets=ROLLING_BUCKETS):
+    """Buckets scores by hour or day: mean, row count and a count-weighted rolling mean.
+
+    Rows without a date are ignored (no dates at all gives empty buckets). Returns
+    (buckets, freq) with the frequency actually used.
+    """
+    series = df.dropna(subset=[date_column]).set_index(date_column)[value_column].astype(float).sort_index()
+    if series.empty:
+        return pd.DataFrame(columns=["Mean", "Count", "Rolling Mean"], index=pd.DatetimeIndex([]), dtype=float), \
+            "D" if freq == "auto" else freq
+    if freq == "auto":
+        freq = "h" if len(series) and series.index[-1] - series.index[0] <= AUTO_HOURLY_SPAN else "D"
+    grouped = series.resample(freq)
+    sums, counts = grouped.sum(), grouped.count()
+    rolling_counts = counts.rolling(rolling_buckets, min_periods=1).sum()
+    buckets = pd.DataFrame({
+        "Mean": grouped.mean(),
+        "Count": counts,
+        "Rolling Mean": (sums.rolling(rolling_buckets, min_periods=1).sum() / rolling_counts).where(rolling_counts > 0),
+    })
+    return buckets, freq
+
+
+def lttb_indices(x, y, threshold=MAX_PLOT_POINTS):
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the line's shape.
+
+    The first and last points are always kept; every bucket in between contributes the
+    point forming the largest triangle with the previous pick and the next bucket's mean.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)  # threshold - 2 buckets between the end points
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = (edges[bucket + 1], edges[bucket + 2]) if bucket + 2 < len(edges) else (n - 1, n)
+        next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(areas.argmax())
+        indices[bucket + 1] = previous
+    return indices
+
+
+def _downsample(series, max_points):
+    series = series.dropna()
+    indices = lttb_indices(series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else series.index,
+                           series.to_numpy(), max_points)
+    return series.iloc[indices]
+
+
+def trend_figure(buckets, freq, title, ylabel, zero_line=False, max_points=MAX_PLOT_POINTS):
+    """Plots bucket means, the rolling mean and row counts (shaded, right axis).
+
+    Each line is LTTB-downsampled to `max_points`. Returns (figure, points plotted).
+    """
+    from matplotlib.figure import Figure
+
+    unit = "hour" if freq == "h" else "day"
+    mean = _downsample(buckets["Mean"], max_points)
+    rolling = _downsample(buckets["Rolling Mean"], max_points)
+    counts = _downsample(buckets["Count"], max_points)
+
+    figure = Figure(figsize=(10, 5))
+    axis = figure.subplots()
+    count_axis = axis.twinx()
+    count_axis.fill_between(counts.index, counts.to_numpy(), step="mid", color="gray", alpha=0.15)
+    count_axis.set_ylabel(f"Rows per {unit}")
+    axis.set_zorder(count_axis.get_zorder() + 1)  # Keep the score lines above the count shading
+    axis.patch.set_visible(False)
+
+    axis.plot(mean.index, mean.to_numpy(), marker="o" if len(mean) <= MARKER_POINTS else None,
+              linewidth=1, alpha=0.6, label=f"Mean per {unit}")
+    axis.plot(rolling.index, rolling.to_numpy(), linewidth=2.5, label=f"{ROLLING_BUCKETS}-{unit} rolling mean")
+    if zero_line:
+        axis.axhline(y=0, color="gray", linestyle="--")
+    axis.set_title(title)
+    axis.set_xlabel("Date")
+    axis.set_ylabel(ylabel)
+    axis.legend(loc="upper left")
+    axis.grid()
+    figure.autofmt_xdate()
+    return figure, len(mean) + len(rolling) + len(counts)
+
+
+def heatmap_page_count(cells, tile_width=HEATMAP_TILE_WIDTH, page_rows=HEATMAP_PAGE_ROWS):
+    """Number of heatmap figures needed to show `cells` scores."""
+    return max(1, math.ceil(cells / (tile_width * page_rows)))
+
+
+def heatmap_figure(scores, cmap, page=0, tile_width=HEATMAP_TILE_WIDTH, page_rows=HEATMAP_PAGE_ROWS,
+                   title="📊 Sentiment Heatmap"):
+    """Draws one page of scores as fixed-width rows (tiles); rows are labelled with their first position.
+
+    Cell values are annotated only when the page holds at most ANNOTATE_MAX_CELLS scores.
+    """
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    page_cells = tile_width * page_rows
+    offset = page * page_cells
+    window = np.asarray(scores[offset:offset + page_cells], dtype=float)
+    width = min(len(window), tile_width)
+    rows = math.ceil(len(window) / width)
+    grid = np.full(rows * width, np.nan)
+    grid[:len(window)] = window
+    grid = grid.reshape(rows, width)
+    annotate = len(window) <= ANNOTATE_MAX_CELLS
+
+    figure = Figure(figsize=(min(max(10, width * 0.5), 25), 0.6 + rows * (0.8 if annotate else 0.4)))
+    axis = figure.subplots()
+    sns.heatmap(grid, ax=axis, mask=np.isnan(grid), annot=annotate, fmt=".2f", cmap=cmap, center=0,
+                linewidths=1 if annotate else 0, xticklabels=False,
+                yticklabels=[offset + row * width + 1 for row in range(rows)] if rows > 1 else False)
+    axis.set_title(title)
+    return figure
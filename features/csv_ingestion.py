@@ -0,0 +1,127 @@
+import os
+
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from features.instrumentation import span
+
+# ✅ Uploads are streamed in row chunks with only the columns a page needs, so memory follows the chunk size
+CSV_CHUNK_ROWS = 20_000
+ARROW_BLOCK_BYTES = 4 << 20  # pyarrow read-ahead block; several blocks make up one chunk
+
+
+def csv_header(file):
+    """Reads only the header row and rewinds, so the body can be streamed afterwards."""
+    columns = pd.read_csv(file, nrows=0).columns.tolist()
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return columns
+
+
+def missing_columns(file, required):
+    """Returns the required columns absent from the CSV header (empty when the file is usable)."""
+    header = set(csv_header(file))
+    return [column for column in required if column not in header]
+
+
+def _arrow_available():
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class CSVChunkReader:
+    """Iterates a CSV as DataFrame chunks holding only `columns`, read as strings.
+
+    Uses pyarrow's streaming reader when installed and pandas' chunked reader otherwise.
+    `date_column` is converted to datetimes as each chunk is read: with the format guessed
+    once from the first value, then per value (`format="mixed"`) for whatever that missed.
+    Values that still don't parse become NaT and are counted in `invalid_dates`. Rows
+    missing any of `dropna` are skipped. `rows` and `progress()` report how far the read has got.
+    """
+
+    def __init__(self, file, columns, date_column=None, dropna=(), chunk_rows=CSV_CHUNK_ROWS):
+        missing = missing_columns(file, columns)
+        if missing:
+            raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}")
+        self.file = file
+        self.columns = list(columns)
+        self.date_column = date_column
+        self.dropna = list(dropna)
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self.invalid_dates = 0  # Non-empty date values that could not be parsed
+        self._date_format = None
+        self._total_bytes = self._size()
+
+    def _size(self):
+        if isinstance(self.file, (str, os.PathLike)):
+            return os.path.getsize(self.file)
+        position = self.file.tell()
+        self.file.seek(0, os.SEEK_END)
+        size = self.file.tell()
+        self.file.seek(position)
+        return size
+
+    def progress(self):
+        """Fraction of the file consumed so far (approximate: readers buffer ahead)."""
+        if isinstance(self.file, (str, os.PathLike)) or not self._total_bytes:
+            return 1.0 if self.rows else 0.0
+        return min(self.file.tell() / self._total_bytes, 1.0)
+
+    def _arrow_chunks(self):
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        reader = pacsv.open_csv(
+            self.file,
+            read_options=pacsv.ReadOptions(block_size=ARROW_BLOCK_BYTES),
+            convert_options=pacsv.ConvertOptions(include_columns=self.columns,
+                                                 column_types={column: pa.string() for column in self.columns}),
+        )
+        batches, rows = [], 0
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= self.chunk_rows:
+                yield pa.Table.from_batches(batches).to_pandas()
+                batches, rows = [], 0
+        if batches:
+            yield pa.Table.from_batches(batches).to_pandas()
+
+    def _pandas_chunks(self):
+        return pd.read_csv(self.file, usecols=self.columns, dtype={column: str for column in self.columns},
+                           chunksize=self.chunk_rows)
+
+    def _prepare(self, chunk):
+        chunk = chunk[self.columns]
+        if self.dropna:
+            chunk = chunk.dropna(subset=self.dropna)
+        if self.date_column:
+            chunk = chunk.assign(**{self.date_column: self._parse_dates(chunk[self.date_column])})
+        return chunk.reset_index(drop=True)
+
+    def _parse_dates(self, values):
+        if self._date_format is None:
+            first = values.dropna()
+            self._date_format = (guess_datetime_format(first.iloc[0]) if len(first) else None) or "mixed"
+        dates = pd.to_datetime(values, format=self._date_format, errors="coerce")
+        missed = dates.isna() & values.notna()
+        if missed.any() and self._date_format != "mixed":  # e.g. "2024-01-05 10:00" among "%Y-%m-%d" values
+            dates[missed] = pd.to_datetime(values[missed], format="mixed", errors="coerce")
+            missed = dates.isna() & values.notna()
+        self.invalid_dates += int(missed.sum())
+        return dates
+
+    def __iter__(self):
+        chunks = iter(self._arrow_chunks() if _arrow_available() else self._pandas_chunks())
+        while True:
+            with span("read_csv_chunk"):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                chunk = self._prepare(chunk)
+            self.rows += len(chunk)
+            yield chunk
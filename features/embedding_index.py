@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+
+import numpy as np
+
+from features.resources import cache_path
+
+SEARCH_BLOCK_ROWS = 65_536  # Index rows scored per matrix product during search
+PAIR_BLOCK_ROWS = 4_096  # Rows per block for all-pairs near-duplicate detection
+INDEX_NAME_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")  # Names become directories under the cache
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive advisory lock on `path`, held across processes (and across instances in one process)."""
+    with open(path, "a+b") as file:
+        if os.name == "nt":
+            import msvcrt
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class EmbeddingIndex:
+    """Append-only, memory-mapped index of L2-normalized sentence embeddings.
+
+    Vectors are stored as float32, or int8 with one float32 scale per row, in a flat
+    file under the cache directory; documents live in a small SQLite table. Indexes
+    persist across sessions and can be extended with new documents at any time.
+    """
+
+    def __init__(self, name, dim, dtype="float32", model_id=None):
+        if dtype not in ("float32", "int8"):
+            raise ValueError(f"Unsupported index dtype: {dtype}")
+        if not INDEX_NAME_PATTERN.fullmatch(name):
+            raise ValueError(f"Invalid index name '{name}': use 1-64 letters, digits, '_' or '-'.")
+        self.name = name
+        self.directory = os.path.dirname(cache_path("indexes", name, "meta.json"))
+        self._meta_path = os.path.join(self.directory, "meta.json")
+        self._lock_path = os.path.join(self.directory, "index.lock")
+        self._lock = threading.Lock()
+        with _file_lock(self._lock_path):
+            if os.path.exists(self._meta_path):
+                self._load_meta()
+                if self.meta["dim"] != dim or self.meta["dtype"] != dtype:
+                    raise ValueError(f"Index '{name}' was built with dim={self.meta['dim']}, dtype={self.meta['dtype']}")
+            else:
+                self.meta = {"dim": dim, "dtype": dtype, "count": 0, "model_id": model_id}
+                self._save_meta()
+            with closing(self._connect()) as conn, conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS docs (row INTEGER PRIMARY KEY, text_hash TEXT UNIQUE, text TEXT)")
+
+    def _connect(self):
+        return sqlite3.connect(os.path.join(self.directory, "docs.sqlite3"), timeout=30)
+
+    def _load_meta(self):
+        with open(self._meta_path, "r", encoding="utf-8") as file:
+            self.meta = json.load(file)
+
+    def _save_meta(self):
+        tmp_path = f"{self._meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.meta, file)
+        os.replace(tmp_path, self._meta_path)
+
+    @property
+    def count(self):
+        return self.meta["count"]
+
+    @property
+    def _vectors_path(self):
+        return os.path.join(self.directory, f"vectors.{self.meta['dtype']}")
+
+    @property
+    def _scales_path(self):
+        return os.path.join(self.directory, "scales.float32")
+
+    def _memmap(self):
+        """Returns read-only views of the stored vectors (and int8 scales)."""
+        dim, count = self.meta["dim"], self.meta["count"]
+        if count == 0:
+            return np.zeros((0, dim), dtype=self.meta["dtype"]), np.zeros(0, dtype="float32")
+        vectors = np.memmap(self._vectors_path, dtype=self.meta["dtype"], mode="r", shape=(count, dim))
+        scales = np.memmap(self._scales_path, dtype="float32", mode="r", shape=(count,)) if self.meta["dtype"] == "int8" else None
+        return vectors, scales
+
+    def _block(self, vectors, scales, start, stop):
+        """Returns rows [start, stop) as float32, dequantizing int8 storage."""
+        block = np.asarray(vectors[start:stop], dtype=np.float32)
+        if scales is not None:
+            block *= np.asarray(scales[start:stop])[:, None]
+        return block
+
+    def add(self, texts, encode, batch_size=256, progress_callback=None):
+        """Encodes and appends documents not already in the index; returns how many were added.
+
+        `encode(list_of_texts)` must return an (n, dim) float array.
+        """
+        hashes = {}
+        for text in texts:
+            text = str(text)
+            hashes.setdefault(hashlib.sha256(text.encode("utf-8")).hexdigest(), text)
+
+        with self._lock:
+            with closing(self._connect()) as conn:
+                known = set()
+                keys = list(hashes)
+                for offset in range(0, len(keys), 500):
+                    chunk = keys[offset:offset + 500]
+                    known.update(row[0] for row in conn.execute(
+                        f"SELECT text_hash FROM docs WHERE text_hash IN ({','.join('?' * len(chunk))})", chunk))
+            pending = [(key, text) for key, text in hashes.items() if key not in known]
+
+            added = 0
+            for offset in range(0, len(pending), batch_size):
+                batch = pending[offset:offset + batch_size]
+                embeddings = np.asarray(encode([text for _, text in batch]), dtype=np.float32)
+                embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+                added += self._append(batch, embeddings)
+                if progress_callback:
+                    progress_callback(offset + len(batch), len(pending))
+        return added
+
+    def _append(self, batch, embeddings):
+        """Writes one batch of vectors and documents, then publishes the new row count.
+
+        Runs under the index's file lock with the row count re-read from disk, so
+        concurrent writers (other sessions or processes) get contiguous rows. Bytes and
+        documents past the published count, left by an append that failed midway, are
+        discarded first; the count is published only after both are written.
+        """
+        with _file_lock(self._lock_path):
+            self._load_meta()
+            start = self.meta["count"]
+            with closing(self._connect()) as conn:
+                keys = [key for key, _ in batch]
+                known = {row[0] for row in conn.execute(
+                    f"SELECT text_hash FROM docs WHERE text_hash IN ({','.join('?' * len(keys))}) AND row < ?",
+                    [*keys, start])}
+                fresh = [i for i, key in enumerate(keys) if key not in known]  # Another writer may have added some
+                if not fresh:
+                    return 0
+                batch, embeddings = [batch[i] for i in fresh], embeddings[fresh]
+
+                dim = self.meta["dim"]
+                if self.meta["dtype"] == "int8":
+                    scales = np.maximum(np.abs(embeddings).max(axis=1), 1e-12) / 127.0
+                    quantized = np.round(embeddings / scales[:, None]).astype(np.int8)
+                    self._write_rows(self._vectors_path, start * dim, quantized)
+                    self._write_rows(self._scales_path, start * 4, scales.astype(np.float32))
+                else:
+                    self._write_rows(self._vectors_path, start * dim * 4, embeddings)
+
+                with conn:
+                    conn.execute("DELETE FROM docs WHERE row >= ?", (start,))
+                    conn.executemany("INSERT INTO docs VALUES (?, ?, ?)",
+                                     [(start + i, key, text) for i, (key, text) in enumerate(batch)])
+            self.meta["count"] = start + len(batch)
+            self._save_meta()
+        return len(batch)
+
+    @staticmethod
+    def _write_rows(path, offset, array):
+        """Truncates `path` to `offset` bytes (the published rows) and appends `array`."""
+        with open(path, "ab") as file:
+            file.truncate(offset)
+            file.write(array.tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+
+    def documents(self, rows):
+        """Returns the stored text for each row id."""
+        rows = [int(row) for row in rows]
+        with closing(self._connect()) as conn:
+            found = {}
+            for offset in range(0, len(rows), 500):
+                chunk = rows[offset:offset + 500]
+                found.update(conn.execute(f"SELECT row, text FROM docs WHERE row IN ({','.join('?' * len(chunk))})", chunk))
+        return [found.get(row) for row in rows]
+
+    def search(self, queries, k=10, block_rows=SEARCH_BLOCK_ROWS):
+        """Returns (scores, rows), each (n_queries, k), of the nearest documents by cosine similarity."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        vectors, scales = self._memmap()
+        k = min(k, self.count)
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+
+        for start in range(0, self.count, block_rows):
+            stop = min(start + block_rows, self.count)
+            scores = queries @ self._block(vectors, scales, start, stop).T
+            candidate_scores = np.concatenate([best_scores, scores], axis=1)
+            candidate_rows = np.concatenate([best_rows, np.broadcast_to(np.arange(start, stop), scores.shape)], axis=1)
+            keep = np.argpartition(-candidate_scores, k - 1, axis=1)[:, :k] if candidate_scores.shape[1] > k else \
+                np.broadcast_to(np.arange(candidate_scores.shape[1]), candidate_scores.shape)
+            best_scores = np.take_along_axis(candidate_scores, keep, axis=1)
+            best_rows = np.take_along_axis(candidate_rows, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_scores, order, axis=1), np.take_along_axis(best_rows, order, axis=1)
+
+    def near_duplicates(self, threshold=0.95, block_rows=PAIR_BLOCK_ROWS, progress_callback=None):
+        """Clusters documents whose cosine similarity is >= threshold (blocked all-pairs + union-find).
+
+        Returns a list of clusters (lists of row ids) with at least two members, largest first.
+        """
+        parent = np.arange(self.count)
+
+        def find(row):
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        vectors, scales = self._memmap()
+        starts = list(range(0, self.count, block_rows))
+        total_blocks = len(starts) * (len(starts) + 1) // 2
+        done = 0
+        for i, row_start in enumerate(starts):
+            left = self._block(vectors, scales, row_start, min(row_start + block_rows, self.count))
+            for col_start in starts[i:]:
+                right = self._block(vectors, scales, col_start, min(col_start + block_rows, self.count))
+                scores = left @ right.T
+                if col_start == row_start:
+                    scores[np.tril_indices(scores.shape[0], 0, scores.shape[1])] = -np.inf  # Each pair once, no self-matches
+                for a, b in zip(*np.nonzero(scores >= threshold)):
+                    root_a, root_b = find(row_start + a), find(col_start + b)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total_blocks)
+
+        clusters = {}
+        for row in range(self.count):
+            clusters.setdefault(find(row), []).append(row)
+        return sorted((members for members in clusters.values() if len(members) > 1), key=len, reverse=True)
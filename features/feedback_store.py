@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# ✅ SQLite feedback database (WAL mode: O(1) appends, safe with concurrent sessions)
+FEEDBACK_DB = os.getenv("NLP_NAVIGATOR_FEEDBACK_DB", "feedback_data.sqlite3")
+LEGACY_FEEDBACK_CSV = "feedback_data.csv"
+
+# Column name in the app -> column name in the database
+FEEDBACK_COLUMNS = {
+    "Name": "name",
+    "Email": "email",
+    "Rating": "rating",
+    "Easy to Use": "easy_to_use",
+    "Challenges": "challenges",
+    "General Feedback": "general_feedback",
+}
+
+_INSERT_SQL = (
+    f"INSERT INTO feedback (submitted_at, {', '.join(FEEDBACK_COLUMNS.values())}) "
+    f"VALUES (?, {', '.join('?' * len(FEEDBACK_COLUMNS))})"
+)
+_SELECT_SQL = f"SELECT id, submitted_at, {', '.join(FEEDBACK_COLUMNS.values())} FROM feedback"
+
+_initialized = set()
+
+
+def _connect(path=FEEDBACK_DB):
+    """Opens a connection, creating the schema and importing the legacy CSV on first use."""
+    conn = sqlite3.connect(path, timeout=30)
+    if path not in _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS feedback ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, submitted_at TEXT NOT NULL, "
+                + ", ".join(f"{column} TEXT" for column in FEEDBACK_COLUMNS.values()) + ")"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY)")
+        _import_legacy_csv(conn)
+        _initialized.add(path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _import_legacy_csv(conn):
+    """Copies rows from the old feedback_data.csv into the database exactly once."""
+    if not os.path.exists(LEGACY_FEEDBACK_CSV):
+        return
+    with conn:
+        claimed = conn.execute("INSERT OR IGNORE INTO migrations VALUES ('legacy_csv')").rowcount
+        if not claimed:
+            return
+        legacy = pd.read_csv(LEGACY_FEEDBACK_CSV, dtype=str).reindex(columns=list(FEEDBACK_COLUMNS))
+        legacy = legacy.astype(object).where(legacy.notna(), None)
+        conn.executemany(_INSERT_SQL, [("legacy", *row) for row in legacy.itertuples(index=False, name=None)])
+
+
+def save_feedback(data):
+    """Appends one feedback entry (a dict keyed by the form's column names)."""
+    values = [None if data.get(column) is None else str(data.get(column)) for column in FEEDBACK_COLUMNS]
+    with closing(_connect()) as conn, conn:
+        conn.execute(_INSERT_SQL, [datetime.now(timezone.utc).isoformat(timespec="seconds"), *values])
+
+
+def count_feedback():
+    """Returns the number of stored feedback entries."""
+    with closing(_connect()) as conn:
+        return conn.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+
+
+def _to_frame(rows):
+    df = pd.DataFrame(rows, columns=["ID", "Submitted At", *FEEDBACK_COLUMNS])
+    df["Rating"] = pd.to_numeric(df["Rating"], errors="coerce")
+    return df
+
+
+def read_feedback(before_id=None, page_size=100):
+    """Returns up to `page_size` entries older than `before_id` (default: the newest), newest first.
+
+    Pass the smallest ID of one page as `before_id` to get the next, so each page is an
+    index range scan however deep it goes.
+    """
+    with closing(_connect()) as conn:
+        rows = conn.execute(f"{_SELECT_SQL} WHERE id < ? ORDER BY id DESC LIMIT ?",
+                            (before_id if before_id is not None else sys.maxsize, page_size)).fetchall()
+    return _to_frame(rows)
+
+
+def iter_feedback(chunk_size=10_000, after_id=0):
+    """Yields all feedback in id order as DataFrames of at most `chunk_size` rows."""
+    with closing(_connect()) as conn:
+        while True:
+            rows = conn.execute(f"{_SELECT_SQL} WHERE id > ? ORDER BY id LIMIT ?", (after_id, chunk_size)).fetchall()
+            if not rows:
+                return
+            after_id = rows[-1][0]
+            yield _to_frame(rows)
+
+
+def export_feedback(path, file_format="csv", chunk_size=10_000):
+    """Writes every entry to CSV or Parquet in chunks, so memory stays bounded."""
+    if file_format == "csv":
+        _to_frame([]).to_csv(path, index=False)  # Header only, so an empty store still exports
+        for chunk in iter_feedback(chunk_size):
+            chunk.to_csv(path, mode="a", header=False, index=False)
+        return path
+
+    if file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.schema([("ID", pa.int64()), ("Submitted At", pa.string()), *(
+            (column, pa.float64() if column == "Rating" else pa.string()) for column in FEEDBACK_COLUMNS
+        )])
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in iter_feedback(chunk_size):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        return path
+
+    raise ValueError(f"Unsupported export format: {file_format}")
@@ -0,0 +1,164 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+MIN_HISTORY = 3  # Closed days needed for a trend forecast (a flat mean forecast is used below)
+ESTIMATE_HISTORY = 7  # Closed days needed before Holt parameters are estimated (fixed smoothing below)
+REFIT_EVERY_DAYS = 7  # Parameters are re-estimated after this many newly closed days
+SMOOTHING_GRID = np.linspace(0.05, 0.95, 19)
+DEFAULT_SMOOTHING = (0.5, 0.3)  # (alpha, beta) for series too short to estimate them
+
+# Values of the forecast's "Model" column
+HOLT_MODEL = "Holt"
+DEFAULT_HOLT_MODEL = "Holt (default smoothing)"
+MEAN_MODEL = "Mean (too little history)"
+
+
+def daily_counts(sentiment_df, date_column="Published At", label_column="Sentiment"):
+    """Pivots articles into a dense day x label count table, filling missing days with 0."""
+    if sentiment_df.empty:
+        return pd.DataFrame()
+    dates = pd.to_datetime(sentiment_df[date_column]).dt.normalize()
+    counts = pd.crosstab(dates, sentiment_df[label_column])
+    full_range = pd.date_range(counts.index.min(), counts.index.max(), freq="D")
+    return counts.reindex(full_range, fill_value=0).astype(float)
+
+
+def _holt_pass(values, alpha, beta, level, trend):
+    """Runs Holt's additive-trend recursion over `values` (time x series) for every series at once.
+
+    `alpha`, `beta`, `level` and `trend` broadcast against one row of `values`.
+    Returns the final level, trend and the one-step-ahead squared error sum.
+    """
+    sse = np.zeros(np.broadcast(level, alpha).shape)
+    for y in values:
+        prediction = level + trend
+        sse += (y - prediction) ** 2
+        new_level = alpha * y + (1 - alpha) * prediction
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        level = new_level
+    return level, trend, sse
+
+
+def fit_holt(values, smoothing=None):
+    """Fits Holt's linear trend for each column of `values` (time x series) by vectorized grid search.
+
+    With `smoothing` = (alpha, beta) the parameters are fixed and only the state is computed.
+    """
+    values = np.asarray(values, dtype=float)
+    level0, trend0 = values[0], values[1] - values[0]
+    if smoothing is not None:
+        alpha, beta = (np.full(values.shape[1], value) for value in smoothing)
+        level, trend, _ = _holt_pass(values[1:], alpha, beta, level0, trend0)
+        return alpha, beta, level, trend
+    alpha, beta = np.meshgrid(SMOOTHING_GRID, SMOOTHING_GRID, indexing="ij")
+    alpha, beta = alpha.ravel()[:, None], beta.ravel()[:, None]  # (grid, 1) against (series,)
+    level, trend, sse = _holt_pass(values[1:], alpha, beta, level0[None, :], trend0[None, :])
+    best = sse.argmin(axis=0)
+    columns = np.arange(values.shape[1])
+    return alpha[best, 0], beta[best, 0], level[best, columns], trend[best, columns]
+
+
+class SentimentForecaster:
+    """Keeps fitted Holt state per sentiment series and updates it as new daily counts arrive.
+
+    The most recent day is treated as still open: it is folded into a forecast but not
+    into the stored state, so later counts for that day never require a refit. Series
+    with fewer than MIN_HISTORY closed days get a flat mean forecast, and those with fewer
+    than ESTIMATE_HISTORY use DEFAULT_SMOOTHING instead of estimated parameters; the
+    forecast's "Model" column says which. Estimated parameters are refreshed every
+    REFIT_EVERY_DAYS closed days.
+    """
+
+    def __init__(self):
+        self.history = pd.DataFrame()  # Closed days applied to the stored state
+        self.params = {}  # label -> (alpha, beta)
+        self.state = {}  # label -> (level, trend) after the last closed day
+        self.fitted_days = {}  # label -> closed days the parameters were estimated on
+        self.models = {}  # label -> HOLT_MODEL or DEFAULT_HOLT_MODEL
+        self._lock = threading.Lock()
+
+    def _refit(self, counts, labels):
+        estimate = len(counts) >= ESTIMATE_HISTORY
+        alpha, beta, level, trend = fit_holt(counts[labels].to_numpy(), None if estimate else DEFAULT_SMOOTHING)
+        for i, label in enumerate(labels):
+            self.params[label] = (alpha[i], beta[i])
+            self.state[label] = (level[i], trend[i])
+            self.fitted_days[label] = len(counts)
+            self.models[label] = HOLT_MODEL if estimate else DEFAULT_HOLT_MODEL
+
+    def update(self, counts):
+        """Brings the stored state up to date with a full daily count table; returns timings."""
+        timings = {"Refit Series": 0, "Updated Series": 0, "Fit Seconds": 0.0, "Update Seconds": 0.0}
+        closed = counts.iloc[:-1]
+        with self._lock:
+            # Series that are new, too short before, stale, or whose closed history changed are refit
+            overlap = closed.index.intersection(self.history.index)
+            refit = []
+            for label in closed.columns:
+                known = label in self.state and label in self.history.columns
+                if not known or not closed.loc[overlap, label].equals(self.history.loc[overlap, label]) \
+                        or self.history.index.min() != closed.index.min() \
+                        or len(closed) - self.fitted_days[label] >= REFIT_EVERY_DAYS \
+                        or self.fitted_days[label] < ESTIMATE_HISTORY <= len(closed):
+                    refit.append(label)
+            refit = [label for label in refit if len(closed) >= MIN_HISTORY]
+
+            start = time.perf_counter()
+            if refit:
+                self._refit(closed, refit)
+            timings["Fit Seconds"] = time.perf_counter() - start
+            timings["Refit Series"] = len(refit)
+
+            # Remaining series only step through the newly closed days
+            start = time.perf_counter()
+            new_days = closed.index.difference(self.history.index)
+            incremental = [label for label in self.state if label in closed.columns and label not in refit]
+            if incremental and len(new_days):
+                alpha, beta, level, trend = (np.array(values) for values in zip(*(
+                    self.params[label] + self.state[label] for label in incremental
+                )))
+                level, trend, _ = _holt_pass(closed.loc[new_days, incremental].to_numpy(), alpha, beta, level, trend)
+                for i, label in enumerate(incremental):
+                    self.state[label] = (level[i], trend[i])
+                timings["Updated Series"] = len(incremental)
+            timings["Update Seconds"] = time.perf_counter() - start
+
+            self.history = closed.copy()
+        return timings
+
+    def forecast(self, counts, horizon=5):
+        """Forecasts `horizon` days after the last day of `counts` for every series.
+
+        Fitted series use their Holt state; series too short to fit are forecast flat at
+        their mean daily count. The "Model" column names the method used for each series.
+        """
+        last_day = counts.index[-1]
+        future_dates = pd.date_range(last_day + pd.Timedelta(days=1), periods=horizon, freq="D")
+        with self._lock:
+            fitted = [label for label in counts.columns if label in self.state]
+            params = [self.params[label] + self.state[label] for label in fitted]
+            models = [self.models[label] for label in fitted]
+        naive = [label for label in counts.columns if label not in fitted]
+        labels = fitted + naive
+        models += [MEAN_MODEL] * len(naive)
+        if not labels:
+            return pd.DataFrame(columns=["Date", "Sentiment", "Count", "Model"])
+
+        level, trend = np.zeros(0), np.zeros(0)
+        if fitted:
+            alpha, beta, level, trend = (np.array(values) for values in zip(*params))
+            # Fold in the still-open last day without storing it
+            level, trend, _ = _holt_pass(counts[fitted].to_numpy()[-1:], alpha, beta, level, trend)
+        level = np.concatenate([level, counts[naive].mean().to_numpy(dtype=float)])
+        trend = np.concatenate([trend, np.zeros(len(naive))])
+        steps = np.arange(1, horizon + 1)[:, None]
+        predictions = level[None, :] + steps * trend[None, :]
+        return pd.DataFrame({
+            "Date": np.repeat(future_dates, len(labels)),
+            "Sentiment": np.tile(labels, horizon),
+            "Count": predictions.ravel(),
+            "Model": np.tile(models, horizon),
+        })
@@ -1,5 +1,7 @@
 import streamlit as st
 import json
+from functools import lru_cache
+from features.model_registry import get_model, is_loaded
 
 # Function to translate roles between Gemini and Streamlit terminology
 def map_role(role):
@@ -14,7 +16,16 @@ def fetch_gemini_response(user_query):
     print(f"Gemini's Response: {response}")
     return response.parts[0].text
 
-# Function for lottie file
+# Function for lottie file (parsed once per process; animations never change at runtime)
+@lru_cache(maxsize=None)
 def load_lottie_file(filepath: str):
     with open(filepath, "r", encoding="utf-8") as file:
-        return json.load(file)
\ No newline at end of file
+        return json.load(file)
+
+# ✅ Fetch a registry model, showing a loading state while it is (still) loading
+def load_model(name):
+    """Returns the shared model for `name`; shows a spinner if it is not resident yet."""
+    if is_loaded(name):
+        return get_model(name)
+    with st.spinner(f"⏳ Loading the {name} model (first use since the server started)..."):
+        return get_model(name)
@@ -0,0 +1,265 @@
+import csv
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unicodedata
+import warnings
+
+from features.resources import cache_path
+
+# ✅ GeoNames-style gazetteer (tab-separated, no header); override with a full cities/allCountries dump
+# The bundled file is resolved from the repository root, not the working directory (cli.py may run anywhere)
+GAZETTEER_FILE = os.getenv("NLP_NAVIGATOR_GAZETTEER",
+                           os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "gazetteer.tsv"))
+NOMINATIM_MIN_DELAY = 1.0  # Seconds between fallback requests (Nominatim usage policy)
+
+# GeoNames column positions
+_NAME, _ASCII_NAME, _ALTERNATE_NAMES, _LATITUDE, _LONGITUDE, _POPULATION = 1, 2, 3, 4, 5, 14
+_FEATURE_CLASS, _FEATURE_CODE, _COUNTRY, _ADMIN1 = 6, 7, 8, 10
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+_gazetteer_index = None
+_index_lock = threading.Lock()
+_cache_conn = None
+_cache_lock = threading.Lock()
+_nominatim = None
+
+
+def normalize_location(name):
+    """Lowercases, strips accents and punctuation so spelling variants share one key."""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+class Gazetteer:
+    """Place names from a GeoNames dump.
+
+    `names` maps every normalized name (incl. alternate names) to the most populous
+    place's (lat, lon). `places` maps primary names to every place called that, as
+    (lat, lon, country code, admin1 code, population), and `regions` maps country and
+    first-level region names (and lowercase country codes) to (country, admin1) pairs;
+    both are used to check "Place, Region" names component by component.
+    """
+
+    def __init__(self):
+        self.names = {}
+        self.places = {}
+        self.regions = {}
+
+    def __len__(self):
+        return len(self.names)
+
+
+def _field(row, position):
+    return row[position] if len(row) > position else ""
+
+
+def load_gazetteer(path=GAZETTEER_FILE):
+    """Builds a Gazetteer, preferring the most populous place per name."""
+    gazetteer = Gazetteer()
+    populations = {}
+    csv.field_size_limit(1 << 24)
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        for row in csv.reader(file, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) <= _LONGITUDE:
+                continue
+            try:
+                coordinates = (float(row[_LATITUDE]), float(row[_LONGITUDE]))
+            except ValueError:
+                continue
+            population = int(row[_POPULATION]) if len(row) > _POPULATION and row[_POPULATION].isdigit() else 0
+            names = {row[_NAME], row[_ASCII_NAME], *row[_ALTERNATE_NAMES].split(",")}
+            for name in names:
+                key = normalize_location(name)
+                if key and population >= populations.get(key, -1):
+                    gazetteer.names[key] = coordinates
+                    populations[key] = population
+
+            country, admin1 = _field(row, _COUNTRY), _field(row, _ADMIN1)
+            place = (*coordinates, country, admin1, population)
+            for key in {normalize_location(row[_NAME]), normalize_location(row[_ASCII_NAME])} - {""}:
+                gazetteer.places.setdefault(key, []).append(place)
+            feature_code = _field(row, _FEATURE_CODE)
+            if _field(row, _FEATURE_CLASS) == "A" and country and (feature_code.startswith("PCL") or feature_code == "ADM1"):
+                region = (country, "" if feature_code.startswith("PCL") else admin1)
+                region_names = names | ({country} if feature_code.startswith("PCL") else set())
+                for key in {normalize_location(name) for name in region_names} - {""}:
+                    gazetteer.regions.setdefault(key, set()).add(region)
+    return gazetteer
+
+
+def imported_gazetteer_path():
+    """Where a gazetteer imported on the Geospatial page is kept (it replaces the bundled one)."""
+    return cache_path("gazetteer", "imported.tsv")
+
+
+def get_gazetteer_index():
+    """Returns the process-wide Gazetteer (imported one if present, else GAZETTEER_FILE), loading it on first use."""
+    global _gazetteer_index
+    with _index_lock:
+        if _gazetteer_index is None:
+            path = imported_gazetteer_path()
+            path = path if os.path.exists(path) else GAZETTEER_FILE
+            if os.path.exists(path):
+                _gazetteer_index = load_gazetteer(path)
+            else:
+                warnings.warn(f"Gazetteer not found at {GAZETTEER_FILE}; only cached and online lookups will resolve "
+                              "places (set NLP_NAVIGATOR_GAZETTEER to a GeoNames file).", RuntimeWarning, stacklevel=2)
+                _gazetteer_index = Gazetteer()
+        return _gazetteer_index
+
+
+def import_gazetteer(file):
+    """Indexes an uploaded GeoNames dump and stores it under a fixed name in the cache.
+
+    The import replaces the in-memory index right away and is loaded again after a
+    restart. The file is only kept if it indexes successfully. Returns the name count.
+    """
+    global _gazetteer_index
+    target = imported_gazetteer_path()
+    with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(target), suffix=".tmp", delete=False) as staging:
+        shutil.copyfileobj(file, staging)
+    try:
+        index = load_gazetteer(staging.name)
+    except Exception:
+        os.remove(staging.name)
+        raise
+    os.replace(staging.name, target)
+    with _index_lock:
+        _gazetteer_index = index
+    return len(index)
+
+
+def reset_gazetteer():
+    """Removes an imported gazetteer; the bundled one is used from the next lookup on."""
+    global _gazetteer_index
+    with _index_lock:
+        if os.path.exists(imported_gazetteer_path()):
+            os.remove(imported_gazetteer_path())
+        _gazetteer_index = None
+
+
+def _component_match(gazetteer, location):
+    """Resolves "Place, Region[, Country]" when the gazetteer confirms every component.
+
+    The first component must name a place whose country (and first-level region, for
+    region hints) matches what each later component names, e.g. "Paris, France" ->
+    Paris FR. Unknown or contradicting hints ("Paris, Texas" without a Texas region
+    or a Paris in it) give None rather than the best-known Paris.
+    """
+    parts = [key for key in (normalize_location(part) for part in str(location).split(",")) if key]
+    if len(parts) < 2:
+        return None
+    hints = [gazetteer.regions.get(part) for part in parts[1:]]
+    if not all(hints):
+        return None
+    candidates = [
+        place for place in gazetteer.places.get(parts[0], [])
+        if all(any(place[2] == country and admin1 in ("", place[3]) for country, admin1 in regions) for regions in hints)
+    ]
+    if not candidates:
+        return None
+    best = max(candidates, key=lambda place: place[4])
+    return best[0], best[1]
+
+
+def _get_cache():
+    """Opens the persistent geocode cache (SQLite) once per process."""
+    global _cache_conn
+    if _cache_conn is None:
+        _cache_conn = sqlite3.connect(cache_path("geocode_cache.sqlite3"), timeout=30, check_same_thread=False)
+        _cache_conn.execute("PRAGMA journal_mode=WAL")
+        _cache_conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocodes (location TEXT PRIMARY KEY, latitude REAL, longitude REAL, source TEXT)"
+        )
+    return _cache_conn
+
+
+def _read_cache(keys):
+    with _cache_lock:
+        conn = _get_cache()
+        found = {}
+        for offset in range(0, len(keys), 500):
+            chunk = keys[offset:offset + 500]
+            rows = conn.execute(
+                f"SELECT location, latitude, longitude FROM geocodes WHERE location IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            found.update((location, (lat, lon)) for location, lat, lon in rows)
+        return found
+
+
+def _write_cache(resolved, source):
+    if not resolved:
+        return
+    with _cache_lock:
+        conn = _get_cache()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?, ?)",
+                [(key, lat, lon, source) for key, (lat, lon) in resolved.items()],
+            )
+
+
+def _nominatim_geocode():
+    """Returns a rate-limited Nominatim geocode function (created once per process)."""
+    global _nominatim
+    if _nominatim is None:
+        from geopy.extra.rate_limiter import RateLimiter
+        from geopy.geocoders import Nominatim
+        geolocator = Nominatim(user_agent="geo-sentiment")
+        _nominatim = RateLimiter(geolocator.geocode, min_delay_seconds=NOMINATIM_MIN_DELAY, max_retries=2, swallow_exceptions=True)
+    return _nominatim
+
+
+def geocode_locations(locations, use_fallback=True, progress_callback=None):
+    """Resolves location names to (lat, lon), or (None, None) when unknown.
+
+    Each distinct name is resolved once: persistent cache first, then an exact match in
+    the offline gazetteer, and only the remaining misses go to the rate-limited Nominatim
+    fallback. A comma-separated name the gazetteer confirms component by component
+    ("Paris, France") is used only when neither resolves the full name, and is never
+    cached, so a later run with the fallback enabled can still find the better answer.
+    Returns a dict keyed by the original location strings.
+    """
+    unique = list(dict.fromkeys(str(location) for location in locations))
+    keys = {location: normalize_location(location) for location in unique}
+    cached = _read_cache(list(set(keys.values())))
+
+    gazetteer = get_gazetteer_index()
+    from_gazetteer = {}
+    from_components = {}
+    unresolved = {}
+    for location in unique:
+        key = keys[location]
+        if cached.get(key, (None, None))[0] is not None:
+            continue
+        if key in gazetteer.names:
+            from_gazetteer[key] = gazetteer.names[key]
+            continue
+        partial = _component_match(gazetteer, location)
+        if partial:
+            from_components[key] = partial
+        if key not in cached:  # Known misses are not sent to the fallback again
+            unresolved.setdefault(key, location)
+    _write_cache(from_gazetteer, "gazetteer")
+
+    from_fallback = {}
+    if use_fallback and unresolved:
+        geocode = _nominatim_geocode()
+        for done, (key, location) in enumerate(unresolved.items(), 1):
+            result = geocode(location, timeout=10)
+            from_fallback[key] = (result.latitude, result.longitude) if result else (None, None)
+            if progress_callback:
+                progress_callback(done, len(unresolved))
+        _write_cache(from_fallback, "nominatim")
+
+    resolved = {**cached, **from_gazetteer, **from_fallback}
+    for key, coordinates in from_components.items():
+        if resolved.get(key, (None, None))[0] is None:
+            resolved[key] = coordinates
+    return {location: resolved.get(keys[location], (None, None)) for location in unique}
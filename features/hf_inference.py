@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from features.instrumentation import span
+
+HF_INFERENCE_URL = os.getenv("HF_INFERENCE_URL", "https://api-inference.huggingface.co/models")
+DEFAULT_BATCH_SIZE = 16  # Texts per request payload
+DEFAULT_MAX_IN_FLIGHT = 4  # Concurrent requests per client
+RETRY_STATUSES = {429, 503}
+MAX_RETRY_DELAY = 30.0  # Seconds; longer server hints are capped so a page never stalls for minutes
+CACHE_LIMIT = 50_000  # Texts remembered per client
+
+
+class InferenceClient:
+    """Batched, concurrent client for the Hugging Face Inference API.
+
+    One pooled `requests.Session` is shared by a bounded thread pool, so scoring
+    many texts costs about one round trip per `max_in_flight` batches.
+    """
+
+    def __init__(self, model, api_key=None, base_url=HF_INFERENCE_URL, batch_size=DEFAULT_BATCH_SIZE,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT, timeout=30, max_retries=4, backoff=1.0):
+        self.url = f"{base_url.rstrip('/')}/{model}"
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight))
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="hf-inference")
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    def _post(self, texts):
+        """Sends one batch, backing off on 429/503 (honouring Retry-After) and on connection errors."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.post(self.url, json={"inputs": texts}, timeout=self.timeout)
+            except requests.RequestException:
+                if attempt == self.max_retries:
+                    return [None] * len(texts)
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+
+            if response.status_code == 200:
+                try:
+                    outputs = response.json()
+                except ValueError:
+                    return [None] * len(texts)
+                if isinstance(outputs, list) and len(outputs) == len(texts):
+                    return outputs
+                return [None] * len(texts)
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return [None] * len(texts)
+
+            time.sleep(min(max(self._server_delay(response), self.backoff * 2 ** attempt), MAX_RETRY_DELAY))
+        return [None] * len(texts)
+
+    @staticmethod
+    def _server_delay(response):
+        """Reads the wait hinted by the server (Retry-After seconds or HTTP date, or the model-loading estimate)."""
+        retry_after = response.headers.get("Retry-After")
+        try:
+            return float(retry_after)
+        except (TypeError, ValueError):
+            pass
+        try:
+            return max((parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            pass
+        try:
+            return float(response.json().get("estimated_time", 0))
+        except (ValueError, AttributeError, TypeError):
+            return 0.0
+
+    def classify(self, texts):
+        """Returns the API output (list of label/score dicts, or None on failure) for each text."""
+        texts = [str(text) for text in texts]
+        with self._cache_lock:
+            results = {text: self._cache[text] for text in texts if text in self._cache}
+        pending = list(dict.fromkeys(text for text in texts if text not in results))
+
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        with span("hf_inference_api"):
+            for batch, outputs in zip(batches, self._executor.map(self._post, batches)):
+                fresh = {text: output for text, output in zip(batch, outputs) if output is not None}
+                results.update(fresh)
+                with self._cache_lock:
+                    self._cache.update(fresh)  # Failures are not cached, so they are retried on the next call
+                    while len(self._cache) > CACHE_LIMIT:
+                        self._cache.pop(next(iter(self._cache)))  # Drop the oldest entry
+
+        return [results.get(text) for text in texts]
+
+    def close(self):
+        """Stops the worker threads and closes pooled connections."""
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+def top_label(output, default="Neutral"):
+    """Returns the highest scoring label from one classification output."""
+    if not output:
+        return default
+    scores = output[0] if isinstance(output[0], list) else output
+    return max(scores, key=lambda x: x["score"])["label"]
@@ -0,0 +1,110 @@
+import time
+
+from features.inference_cache import cache_key, get_inference_cache
+from features.inference_scheduler import get_scheduler
+from features.instrumentation import span
+from features.model_registry import MODEL_SPECS, get_model
+
+DEFAULT_BATCH_SIZE = 32
+
+
+def token_lengths(model, texts):
+    """Returns the token count of each text, using the pipeline's tokenizer when available."""
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        return [len(text.split()) for text in texts]
+    encoded = tokenizer(texts, add_special_tokens=True, truncation=True)
+    return [len(ids) for ids in encoded["input_ids"]]
+
+
+def run_batched(model, texts, batch_size=DEFAULT_BATCH_SIZE, progress_callback=None, **params):
+    """Runs a pipeline over texts in length-sorted batches and returns outputs in input order.
+
+    Sorting by token length keeps padding inside each batch small. `progress_callback`
+    is called as `(done, total, elapsed_seconds)` after every batch.
+    """
+    texts = [str(text) for text in texts]
+    total = len(texts)
+    results = [None] * total
+    if not total:
+        return results
+
+    with span("tokenize"):
+        lengths = token_lengths(model, texts)
+    order = sorted(range(total), key=lengths.__getitem__)
+
+    start = time.perf_counter()
+    with span("inference"):
+        for offset in range(0, total, batch_size):
+            batch_idx = order[offset:offset + batch_size]
+            outputs = model([texts[i] for i in batch_idx], batch_size=len(batch_idx), truncation=True, **params)
+            for i, output in zip(batch_idx, outputs):
+                results[i] = output
+            if progress_callback:
+                progress_callback(min(offset + batch_size, total), total, time.perf_counter() - start)
+    return results
+
+
+def model_revision(model):
+    """Returns the commit hash the model weights were loaded from, if known."""
+    for candidate in (getattr(model, "model", None), model):
+        config = getattr(candidate, "config", None)
+        if config is not None:
+            return getattr(config, "_commit_hash", None)
+    return None
+
+
+def run_cached(model_name, texts, batch_size=None, progress_callback=None, **params):
+    """Runs a registry model over texts, serving repeated inputs from the on-disk cache.
+
+    Only texts missing from the cache are scored (each distinct text once), and
+    their outputs are written back so later pages and sessions can reuse them.
+    Small sets of misses from interactive calls (no `batch_size` or
+    `progress_callback`) go through the shared micro-batching scheduler, so
+    concurrent sessions share forward passes. Everything else is batched in the
+    calling thread with the caller's batch size (DEFAULT_BATCH_SIZE if unset), so
+    explicit batch sizes and thread-pool fan-out keep their effect.
+    """
+    texts = [str(text) for text in texts]
+    model = get_model(model_name)
+    model_id = MODEL_SPECS[model_name]["model_id"]
+    revision = model_revision(model)
+    keys = [cache_key(model_id, revision, params, text) for text in texts]
+
+    cache = get_inference_cache()
+    outputs = cache.get_many(keys)
+
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key not in outputs:
+            pending.setdefault(key, text)
+
+    if pending:
+        cached_rows = sum(1 for key in keys if key in outputs)
+        remaining_rows = len(texts) - cached_rows
+
+        def report(done, total, elapsed):
+            progress_callback(cached_rows + round(remaining_rows * done / total), len(texts), elapsed)
+
+        scheduler = get_scheduler(model_name) if batch_size is None and progress_callback is None else None
+        if scheduler is not None and len(pending) <= scheduler.max_batch_size:
+            results = scheduler.submit(list(pending.values()), **params).result()
+        else:
+            results = run_batched(model, list(pending.values()), batch_size=batch_size or DEFAULT_BATCH_SIZE,
+                                  progress_callback=report if progress_callback else None, **params)
+        fresh = dict(zip(pending.keys(), results))
+        cache.put_many(fresh)
+        outputs.update(fresh)
+    elif progress_callback:
+        progress_callback(len(texts), len(texts), 0.0)
+
+    return [outputs[key] for key in keys]
+
+
+def signed_score(result):
+    """Maps a POSITIVE/NEGATIVE classification to a score in [-1, 1]."""
+    if result["label"] == "POSITIVE":
+        return result["score"]
+    if result["label"] == "NEGATIVE":
+        return -result["score"]
+    return 0
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from features.resources import cache_path
+
+# ✅ Size cap for the on-disk inference cache (MB)
+INFERENCE_CACHE_MAX_MB = float(os.getenv("NLP_NAVIGATOR_INFERENCE_CACHE_MB", "512"))
+_SQLITE_MAX_VARS = 500  # Keys per IN (...) query, well under SQLite's variable limit
+
+
+def normalize_text(text):
+    """Normalizes unicode and whitespace so equivalent inputs share a cache entry."""
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+def cache_key(model_id, revision, params, text):
+    """Builds the content-addressed key for one (model, params, text) inference."""
+    text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    payload = json.dumps([model_id, revision or "", params or {}, text_hash], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class InferenceCache:
+    """SQLite-backed key/value store for model outputs with LRU eviction."""
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get_many(self, keys):
+        """Returns {key: value} for every key present in the cache."""
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for offset in range(0, len(unique_keys), _SQLITE_MAX_VARS):
+                chunk = unique_keys[offset:offset + _SQLITE_MAX_VARS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(f"SELECT key, value FROM entries WHERE key IN ({placeholders})", chunk).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE entries SET last_access = ? WHERE key IN ({','.join('?' * len(rows))})",
+                        [time.time()] + [key for key, _ in rows],
+                    )
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, items):
+        """Stores {key: value} pairs in one transaction and evicts if over the cap."""
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            encoded = json.dumps(value)
+            rows.append((key, encoded, len(encoded), now))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+            self._total_bytes += sum(row[2] for row in rows)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Deletes least recently used entries until the cache is at 90% of its cap."""
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        target = self.max_bytes * 0.9
+        while self._total_bytes > target:
+            rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access LIMIT 1000").fetchall()
+            if not rows:
+                break
+            freed_keys = []
+            for key, size in rows:
+                freed_keys.append(key)
+                self._total_bytes -= size
+                if self._total_bytes <= target:
+                    break
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in freed_keys])
+
+    def clear(self):
+        """Removes every cached entry and resets the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._total_bytes = 0
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Returns entry count, size and hit/miss counters."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "Entries": entries,
+                "Size (MB)": round(self._total_bytes / 1024 / 1024, 2),
+                "Hits": self.hits,
+                "Misses": self.misses,
+                "Hit Rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_inference_cache():
+    """Returns the process-wide inference cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = InferenceCache(cache_path("inference_cache.sqlite3"), INFERENCE_CACHE_MAX_MB * 1024 * 1024)
+        return _cache
@@ -0,0 +1,135 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from features.model_registry import get_model
+
+# ✅ Requests from concurrent sessions are coalesced into one forward pass (per model)
+MAX_BATCH_SIZE = int(os.getenv("NLP_NAVIGATOR_MICROBATCH_SIZE", "32"))
+MAX_WAIT_MS = float(os.getenv("NLP_NAVIGATOR_MICROBATCH_WAIT_MS", "10"))
+LATENCY_WINDOW = 10_000  # Most recent requests kept for the latency percentiles
+
+
+class _Request:
+    __slots__ = ("texts", "params", "params_key", "future", "submitted_at")
+
+    def __init__(self, texts, params):
+        self.texts = texts
+        self.params = params
+        self.params_key = json.dumps(params, sort_keys=True, default=str)
+        self.future = Future()
+        self.submitted_at = time.perf_counter()
+
+
+class MicroBatchScheduler:
+    """Collects small inference requests into micro-batches run on one background thread.
+
+    A batch is dispatched once it holds `max_batch_size` texts or the oldest request has
+    waited `max_wait_ms`. Requests with different pipeline parameters never share a
+    forward pass. `submit` returns a Future resolving to the outputs in input order.
+    """
+
+    def __init__(self, model_name, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.model_name = model_name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._requests = 0
+        self._thread = threading.Thread(target=self._run, name=f"microbatch-{model_name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts, **params):
+        """Queues texts for inference and returns a Future of their outputs."""
+        request = _Request([str(text) for text in texts], params)
+        if not request.texts:
+            request.future.set_result([])
+            return request.future
+        self._queue.put(request)
+        return request.future
+
+    def _collect(self):
+        """Blocks for the first request, then gathers more until the batch is full or the wait expires."""
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch_size:
+            try:
+                request = self._queue.get(timeout=max(0.0, deadline - time.perf_counter())) \
+                    if self.max_wait else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self):
+        from features.inference import run_batched
+
+        while True:
+            batch = self._collect()
+            groups = {}
+            for request in batch:
+                groups.setdefault(request.params_key, []).append(request)
+            for requests in groups.values():
+                texts = [text for request in requests for text in request.texts]
+                try:
+                    outputs = run_batched(get_model(self.model_name), texts, batch_size=self.max_batch_size,
+                                          **requests[0].params)
+                except Exception as e:
+                    for request in requests:
+                        request.future.set_exception(e)
+                    continue
+                finished_at = time.perf_counter()
+                offset = 0
+                for request in requests:
+                    request.future.set_result(outputs[offset:offset + len(request.texts)])
+                    offset += len(request.texts)
+                with self._stats_lock:
+                    self._batch_sizes[len(texts)] += 1
+                    self._requests += len(requests)
+                    self._latencies.extend(finished_at - request.submitted_at for request in requests)
+
+    def stats(self):
+        """Returns queue depth, request/batch counts, the batch-size histogram ("size×batches") and latency percentiles."""
+        with self._stats_lock:
+            latencies = np.array(self._latencies) * 1000
+            batches = sum(self._batch_sizes.values())
+            return {
+                "Model": self.model_name,
+                "Queue Depth": self._queue.qsize(),
+                "Requests": self._requests,
+                "Batches": batches,
+                "Mean Batch Size": round(sum(size * count for size, count in self._batch_sizes.items()) / batches, 1)
+                if batches else 0.0,
+                "Batch Sizes": ", ".join(f"{size}×{count}" for size, count in sorted(self._batch_sizes.items())),
+                "p50 Latency (ms)": round(float(np.percentile(latencies, 50)), 1) if len(latencies) else None,
+                "p99 Latency (ms)": round(float(np.percentile(latencies, 99)), 1) if len(latencies) else None,
+            }
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(model_name):
+    """Returns the process-wide scheduler for a registry model, starting it on first use."""
+    with _schedulers_lock:
+        if model_name not in _schedulers:
+            _schedulers[model_name] = MicroBatchScheduler(model_name)
+        return _schedulers[model_name]
+
+
+def scheduler_report():
+    """Returns one stats row per running scheduler."""
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    return [scheduler.stats() for scheduler in schedulers]
@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import ContextDecorator
+
+import psutil
+
+# ✅ Opt-in stage timing: NLP_NAVIGATOR_METRICS=1 records spans to the session panel and a JSONL log
+METRICS_ENABLED = os.getenv("NLP_NAVIGATOR_METRICS", "").lower() in ("1", "true", "yes")
+METRICS_LOG = os.getenv("NLP_NAVIGATOR_METRICS_LOG", "")  # Defaults to <cache dir>/metrics.jsonl
+SESSION_SPANS = 200  # Most recent spans kept per browser session
+
+_log_lock = threading.Lock()
+
+
+def process_rss():
+    """Returns the resident set size of this process in bytes."""
+    return psutil.Process().memory_info().rss
+
+
+def metrics_log_path():
+    if METRICS_LOG:
+        return METRICS_LOG
+    from features.resources import cache_path
+    return cache_path("metrics.jsonl")
+
+
+def _session():
+    """Returns (session id, session state) when running inside a Streamlit script thread."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None, None
+    ctx = get_script_run_ctx()
+    if ctx is None:  # Background threads (warmup, micro-batching) have no session
+        return None, None
+    return ctx.session_id, ctx.session_state
+
+
+def _record(entry):
+    session_id, session_state = _session()
+    entry["session"] = session_id
+    if session_state is not None:
+        if "metrics_spans" not in session_state:
+            session_state["metrics_spans"] = deque(maxlen=SESSION_SPANS)
+        session_state["metrics_spans"].append(entry)
+    line = json.dumps(entry)
+    with _log_lock:
+        with open(metrics_log_path(), "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+class span(ContextDecorator):
+    """Times a named stage (wall time, thread CPU time, RSS delta); usable as `with` or decorator.
+
+    When metrics are disabled, entering and leaving a span is a single flag check.
+    CPU time is that of the calling thread, so concurrent sessions don't inflate it.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if METRICS_ENABLED:
+            self._rss = process_rss()
+            self._cpu = time.thread_time()
+            self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if not METRICS_ENABLED:
+            return False
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        rss = process_rss()
+        _record({
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "span": self.name,
+            "wall_ms": round(wall * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+            "rss_delta_mb": round((rss - self._rss) / 1024 / 1024, 2),
+            "error": exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+
+def session_spans():
+    """Returns this session's most recent spans, newest first."""
+    _, session_state = _session()
+    if session_state is None or "metrics_spans" not in session_state:
+        return []
+    return list(reversed(session_state["metrics_spans"]))
+
+
+def aggregate_metrics(path=None, chunk_rows=100_000):
+    """Per-stage count, p50/p95 wall time, mean CPU time and mean RSS delta over the whole log."""
+    import pandas as pd
+
+    path = path or metrics_log_path()
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return pd.DataFrame(columns=["Stage", "Calls", "p50 Wall (ms)", "p95 Wall (ms)", "Mean CPU (ms)", "Mean RSS Δ (MB)"])
+    spans = pd.concat(
+        chunk[["span", "wall_ms", "cpu_ms", "rss_delta_mb"]]
+        for chunk in pd.read_json(path, lines=True, chunksize=chunk_rows)
+    )
+    grouped = spans.groupby("span")
+    return pd.DataFrame({
+        "Calls": grouped.size(),
+        "p50 Wall (ms)": grouped["wall_ms"].median().round(1),
+        "p95 Wall (ms)": grouped["wall_ms"].quantile(0.95).round(1),
+        "Mean CPU (ms)": grouped["cpu_ms"].mean().round(1),
+        "Mean RSS Δ (MB)": grouped["rss_delta_mb"].mean().round(2),
+    }).sort_values("p95 Wall (ms)", ascending=False).rename_axis("Stage").reset_index()
@@ -0,0 +1,74 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+
+from features.text_preprocessing import tokenize
+
+CANDIDATE_CACHE_LIMIT = 500_000  # Candidate embeddings kept in memory per process
+
+_candidate_cache = {}  # (model id, candidate) -> normalized embedding
+_candidate_lock = threading.Lock()
+
+
+def embed_candidates(candidates, encode, model_id, batch_size=256):
+    """Returns normalized embeddings for candidates, encoding only those not seen before."""
+    with _candidate_lock:
+        cached = {candidate: _candidate_cache[(model_id, candidate)] for candidate in candidates
+                  if (model_id, candidate) in _candidate_cache}
+    missing = [candidate for candidate in candidates if candidate not in cached]
+    fresh = {}
+    for offset in range(0, len(missing), batch_size):
+        batch = missing[offset:offset + batch_size]
+        fresh.update(zip(batch, np.asarray(encode(batch), dtype=np.float32)))
+    with _candidate_lock:
+        _candidate_cache.update(((model_id, candidate), vector) for candidate, vector in fresh.items())
+        while len(_candidate_cache) > CANDIDATE_CACHE_LIMIT:
+            _candidate_cache.pop(next(iter(_candidate_cache)))
+    vectors = [fresh[candidate] if candidate in fresh else cached[candidate] for candidate in candidates]
+    return np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+
+def extract_corpus_keyphrases(documents, encode, model_id, top_n=5, ngram_range=(1, 2), batch_size=64,
+                              progress_callback=None):
+    """KeyBERT-style keyphrases for every document, with n-gram candidates embedded once per corpus.
+
+    `encode(texts)` must return L2-normalized embeddings. Returns a list of
+    [(phrase, score), ...] per document, in input order.
+    """
+    documents = [str(document) for document in documents]
+    try:
+        vectorizer = CountVectorizer(
+            ngram_range=ngram_range, tokenizer=tokenize, token_pattern=None, stop_words="english",
+        ).fit(documents)
+    except ValueError:  # Only stop words / empty corpus
+        return [[] for _ in documents]
+    doc_candidates = vectorizer.transform(documents).tocsr()
+    candidates = vectorizer.get_feature_names_out().tolist()
+
+    candidate_embeddings = embed_candidates(candidates, encode, model_id)
+    keyphrases = []
+    for offset in range(0, len(documents), batch_size):
+        doc_embeddings = np.asarray(encode(documents[offset:offset + batch_size]), dtype=np.float32)
+        for row, doc_embedding in enumerate(doc_embeddings, start=offset):
+            candidate_ids = doc_candidates.indices[doc_candidates.indptr[row]:doc_candidates.indptr[row + 1]]
+            if not len(candidate_ids):
+                keyphrases.append([])
+                continue
+            scores = candidate_embeddings[candidate_ids] @ doc_embedding
+            best = np.argsort(-scores)[:top_n]
+            keyphrases.append([(candidates[candidate_ids[i]], round(float(scores[i]), 4)) for i in best])
+        if progress_callback:
+            progress_callback(min(offset + batch_size, len(documents)), len(documents))
+    return keyphrases
+
+
+def corpus_top_keyphrases(keyphrases, top_n=20):
+    """Ranks phrases across the corpus by how many documents selected them, then by mean relevance."""
+    rows = [(phrase, score) for document in keyphrases for phrase, score in document]
+    if not rows:
+        return pd.DataFrame(columns=["Key Phrase", "Documents", "Mean Relevance"])
+    table = pd.DataFrame(rows, columns=["Key Phrase", "Relevance"])
+    summary = table.groupby("Key Phrase")["Relevance"].agg(Documents="size", **{"Mean Relevance": "mean"})
+    return summary.sort_values(["Documents", "Mean Relevance"], ascending=False).head(top_n).reset_index()
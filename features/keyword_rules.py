@@ -0,0 +1,108 @@
+import glob
+import os
+import re
+import threading
+import warnings
+
+import pandas as pd
+
+# ✅ Folder of term<TAB>weight lexicon files used by the rule-based sentiment boost
+# Resolved from the repository root, not the working directory
+LEXICON_DIR = os.getenv("NLP_NAVIGATOR_LEXICONS",
+                        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "lexicons"))
+DECISION_THRESHOLD = 1.0  # |weighted score| needed before the rules decide without the model
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def load_lexicon_file(path):
+    """Reads `term<TAB>weight` lines; `#` starts a comment and a trailing `*` marks a prefix term."""
+    terms = {}
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            term, _, weight = line.partition("\t")
+            terms[" ".join(term.lower().split())] = float(weight or 1)
+    return terms
+
+
+def _trie_regex(terms):
+    """Builds a regex alternation factored as a character trie, so thousands of terms stay fast."""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        optional = "" in node
+        branches = [(r"\s+" if char == " " else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if optional else body
+
+    return build(trie)
+
+
+class KeywordEngine:
+    """Compiled multi-pattern matcher over a weighted lexicon, applied to whole columns at once.
+
+    Prefix terms match through the end of the word, so the matched text ("vulnerability")
+    is reported and scored with the weight of the longest prefix rule it starts with.
+    """
+
+    def __init__(self, terms):
+        self.exact = {term: weight for term, weight in terms.items() if not term.endswith("*")}
+        self.prefixes = {term.rstrip("*"): weight for term, weight in terms.items() if term.endswith("*")}
+        alternatives = []
+        if self.exact:
+            alternatives.append(rf"(?:{_trie_regex(self.exact)})\b")
+        if self.prefixes:
+            alternatives.append(rf"(?:{_trie_regex(self.prefixes)})\w*")
+        self.pattern = re.compile(r"\b(?:" + "|".join(alternatives) + ")", re.IGNORECASE) if alternatives else None
+
+    def weight(self, term):
+        """Weight of a matched term: its exact rule, else its longest matching prefix rule."""
+        if term in self.exact:
+            return self.exact[term]
+        return next((self.prefixes[term[:end]] for end in range(len(term), 0, -1) if term[:end] in self.prefixes), 0.0)
+
+    def match(self, texts):
+        """Returns a DataFrame with the matched terms and weighted rule score for each text."""
+        texts = pd.Series(texts, dtype="object").fillna("").astype(str).reset_index(drop=True)
+        if self.pattern is None:
+            matches = pd.Series([[] for _ in range(len(texts))])
+        else:
+            matches = texts.str.findall(self.pattern).map(lambda found: [" ".join(term.lower().split()) for term in found])
+        scores = matches.map(lambda found: sum(self.weight(term) for term in found))
+        return pd.DataFrame({"Matched Terms": matches.map(lambda found: sorted(set(found))), "Rule Score": scores})
+
+
+def get_keyword_engine(lexicon_dir=LEXICON_DIR):
+    """Returns the engine for every lexicon file in `lexicon_dir`, rebuilt only when a file changes."""
+    paths = sorted(glob.glob(os.path.join(lexicon_dir, "*.tsv")) + glob.glob(os.path.join(lexicon_dir, "*.txt")))
+    signature = tuple((path, os.path.getmtime(path)) for path in paths)
+    with _engines_lock:
+        if _engines.get(lexicon_dir, (None,))[0] != signature:
+            if not paths:
+                warnings.warn(f"No lexicon files (*.tsv, *.txt) found in {lexicon_dir}; keyword rules will not match "
+                              "anything (set NLP_NAVIGATOR_LEXICONS to a lexicon folder).", RuntimeWarning, stacklevel=2)
+            terms = {}
+            for path in paths:
+                terms.update(load_lexicon_file(path))
+            _engines[lexicon_dir] = (signature, KeywordEngine(terms))
+        return _engines[lexicon_dir][1]
+
+
+def rule_labels(rule_scores, threshold=DECISION_THRESHOLD):
+    """Maps weighted rule scores to POSITIVE/NEGATIVE, or None when the rules are undecided."""
+    return [
+        "NEGATIVE" if score <= -threshold else "POSITIVE" if score >= threshold else None
+        for score in rule_scores
+    ]
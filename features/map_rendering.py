@@ -0,0 +1,138 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+ROW_MARKER_LIMIT = 500  # Above this many rows, render aggregated points instead of one marker per row
+DETAIL_ZOOM = 8  # Zoom level at which the row-level cluster layer replaces the aggregates
+
+
+@lru_cache(maxsize=None)
+def _zoom_toggle_class():
+    """Defines the zoom toggle element on first use, so folium/branca load only when a map is built."""
+    from branca.element import MacroElement
+    from jinja2 import Template
+
+    class ZoomToggle(MacroElement):
+        """Shows the detail layer only at or above `min_zoom`, and the overview layer below it."""
+
+        _template = Template("""
+            {% macro script(this, kwargs) %}
+            (function() {
+                var map = {{ this._parent.get_name() }};
+                function toggleLayers() {
+                    if (map.getZoom() >= {{ this.min_zoom }}) {
+                        map.removeLayer({{ this.overview.get_name() }});
+                        map.addLayer({{ this.detail.get_name() }});
+                    } else {
+                        map.removeLayer({{ this.detail.get_name() }});
+                        map.addLayer({{ this.overview.get_name() }});
+                    }
+                }
+                map.on("zoomend", toggleLayers);
+                toggleLayers();
+            })();
+            {% endmacro %}
+        """)
+
+        def __init__(self, overview, detail, min_zoom):
+            super().__init__()
+            self._name = "ZoomToggle"
+            self.overview = overview
+            self.detail = detail
+            self.min_zoom = min_zoom
+
+    return ZoomToggle
+
+
+def sentiment_color(score):
+    """Maps a sentiment score to the marker colour used on the map."""
+    return "green" if score > 0 else "red" if score < 0 else "orange"
+
+
+def aggregate_points(df, mode="Location", cell_degrees=1.0):
+    """Groups rows by location (or by a lat/lon grid cell) with mean sentiment and count."""
+    points = pd.DataFrame({
+        "Latitude": df["Coordinates"].map(lambda coords: coords[0]),
+        "Longitude": df["Coordinates"].map(lambda coords: coords[1]),
+        "Sentiment Score": df["Sentiment Score"],
+        "Location": df["Location"].astype(str),
+    })
+    if mode == "Grid":
+        points["Latitude"] = (np.floor(points["Latitude"] / cell_degrees) + 0.5) * cell_degrees
+        points["Longitude"] = (np.floor(points["Longitude"] / cell_degrees) + 0.5) * cell_degrees
+    else:
+        points["Latitude"] = points["Latitude"].round(4)
+        points["Longitude"] = points["Longitude"].round(4)
+
+    return (
+        points.groupby(["Latitude", "Longitude"], sort=False)
+        .agg(**{
+            "Mean Sentiment": ("Sentiment Score", "mean"),
+            "Count": ("Sentiment Score", "size"),
+            "Location": ("Location", "first"),
+            "Places": ("Location", "nunique"),
+        })
+        .reset_index()
+    )
+
+
+def _add_row_markers(df, sentiment_map):
+    """Adds one marker per row (the original rendering, used for small uploads)."""
+    import folium
+    from folium.plugins import MarkerCluster
+
+    marker_cluster = MarkerCluster().add_to(sentiment_map)
+    for location, (lat, lon), sentiment in zip(df["Location"], df["Coordinates"], df["Sentiment Score"]):
+        folium.Marker(
+            location=[lat, lon],
+            popup=f"{location}\nSentiment Score: {sentiment:.2f}",
+            icon=folium.Icon(color=sentiment_color(sentiment)),
+        ).add_to(marker_cluster)
+
+
+def build_sentiment_map(df, mode="Location", cell_degrees=1.0, show_row_cluster=True, row_marker_limit=ROW_MARKER_LIMIT):
+    """Builds the folium map and returns (map, server-rendered points, zoom-in cluster points).
+
+    Small uploads keep one marker per row. Larger ones are aggregated on the server
+    into one circle per location/grid cell; the optional row-level layer is a compact
+    client-side cluster that only appears once the user zooms in.
+    """
+    import folium
+    from folium.plugins import FastMarkerCluster
+
+    sentiment_map = folium.Map(location=[20, 0], zoom_start=2)
+
+    if len(df) <= row_marker_limit:
+        _add_row_markers(df, sentiment_map)
+        return sentiment_map, len(df), 0
+
+    aggregated = aggregate_points(df, mode=mode, cell_degrees=cell_degrees)
+    overview = folium.FeatureGroup(name="Aggregated sentiment").add_to(sentiment_map)
+    max_count = aggregated["Count"].max()
+    for lat, lon, mean_sentiment, count, location, places in zip(
+        aggregated["Latitude"], aggregated["Longitude"], aggregated["Mean Sentiment"],
+        aggregated["Count"], aggregated["Location"], aggregated["Places"],
+    ):
+        label = location if places == 1 else f"{places} places"
+        folium.CircleMarker(
+            location=[lat, lon],
+            radius=4 + 16 * math.sqrt(count / max_count),
+            color=sentiment_color(mean_sentiment),
+            fill=True,
+            fill_opacity=0.6,
+            weight=1,
+            popup=f"{label}\nMean Sentiment: {mean_sentiment:.2f}\nRows: {count:,}",
+        ).add_to(overview)
+
+    detail_points = 0
+    if show_row_cluster:
+        detail = FastMarkerCluster(
+            data=[[lat, lon] for lat, lon in df["Coordinates"]],
+            name="Rows (zoomed in)",
+        ).add_to(sentiment_map)
+        sentiment_map.add_child(_zoom_toggle_class()(overview, detail, DETAIL_ZOOM))
+        detail_points = len(df)
+
+    return sentiment_map, len(aggregated), detail_points
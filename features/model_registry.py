@@ -0,0 +1,232 @@
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from features.instrumentation import process_rss, span
+from features.startup_profile import profiled
+
+# ✅ Memory budget for all resident models (MB, 0 = unlimited)
+MODEL_MEMORY_BUDGET_MB = float(os.getenv("NLP_NAVIGATOR_MODEL_BUDGET_MB", "0"))
+
+SENTIMENT_MODEL_ID = "distilbert/distilbert-base-uncased-finetuned-sst-2-english"
+EMOTION_MODEL_ID = "j-hartmann/emotion-english-distilroberta-base"
+SUMMARIZER_MODEL_ID = "sshleifer/distilbart-cnn-12-6"
+EMBEDDING_MODEL_ID = "all-MiniLM-L6-v2"
+
+# ✅ Backend for the sentiment/emotion classifiers: "torch" (default) or "onnx" (quantized int8, CPU)
+INFERENCE_BACKEND = os.getenv("NLP_NAVIGATOR_BACKEND", "torch").lower()
+
+# ✅ Models loaded on a background thread when the server starts (comma-separated names, empty = none)
+WARMUP_MODELS = [name.strip() for name in os.getenv("NLP_NAVIGATOR_WARMUP_MODELS", "sentiment,emotion,embedding").split(",")
+                 if name.strip()]
+
+
+def _load_pipeline(task, model_id):
+    from transformers import pipeline
+    return pipeline(task, model=model_id)
+
+
+def _load_classifier(task, model_id):
+    """Loads a text-classification pipeline on the configured backend."""
+    if INFERENCE_BACKEND == "onnx":
+        from features.onnx_backend import load_onnx_pipeline
+        return load_onnx_pipeline(task, model_id)
+    return _load_pipeline(task, model_id)
+
+
+def _classifier_cache_id(model_id):
+    """Model id recorded for cached outputs; ONNX results never mix with PyTorch ones."""
+    return f"{model_id}@onnx-int8" if INFERENCE_BACKEND == "onnx" else model_id
+
+
+def _load_sentence_transformer(model_id):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_id)
+
+
+# ✅ Every model used by the pages, loaded lazily by name
+MODEL_SPECS = {
+    "sentiment": {"model_id": _classifier_cache_id(SENTIMENT_MODEL_ID),
+                  "loader": lambda: _load_classifier("sentiment-analysis", SENTIMENT_MODEL_ID)},
+    "emotion": {"model_id": _classifier_cache_id(EMOTION_MODEL_ID),
+                "loader": lambda: _load_classifier("text-classification", EMOTION_MODEL_ID)},
+    "summarizer": {"model_id": SUMMARIZER_MODEL_ID, "loader": lambda: _load_pipeline("summarization", SUMMARIZER_MODEL_ID)},
+    "embedding": {"model_id": EMBEDDING_MODEL_ID, "loader": lambda: _load_sentence_transformer(EMBEDDING_MODEL_ID)},
+}
+
+_models = OrderedDict()  # name -> entry dict, least recently used first
+_lock = threading.RLock()
+_load_locks = {}
+_budget_bytes = MODEL_MEMORY_BUDGET_MB * 1024 * 1024
+_loading = set()  # Names whose loader is currently running
+_warmup_thread = None
+_warmup_errors = {}
+
+
+def register_model(name, loader, model_id=None):
+    """Adds (or replaces) a named model loader in the registry."""
+    with _lock:
+        MODEL_SPECS[name] = {"model_id": model_id or name, "loader": loader}
+        _models.pop(name, None)
+
+
+def _torch_modules(model):
+    """Finds the torch modules that hold the weights of a loaded model."""
+    modules = []
+    for candidate in (model, getattr(model, "model", None)):
+        if candidate is not None and hasattr(candidate, "parameters") and hasattr(candidate, "buffers"):
+            modules.append(candidate)
+    return modules
+
+
+def _model_nbytes(model):
+    """Returns the bytes held by a model's parameters and buffers (ONNX: the model file size)."""
+    seen = set()
+    total = 0
+    modules = _torch_modules(model)
+    model_path = getattr(getattr(model, "model", None), "model_path", None)
+    if not modules and model_path and os.path.exists(model_path):
+        return os.path.getsize(model_path)
+    for module in modules:
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            key = tensor.data_ptr()
+            if key in seen:
+                continue
+            seen.add(key)
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def _evict_over_budget(keep):
+    """Drops least recently used models until the budget is respected."""
+    if _budget_bytes <= 0:
+        return
+    evicted = False
+    while sum(entry["bytes"] for entry in _models.values()) > _budget_bytes:
+        victim = next((name for name in _models if name != keep), None)
+        if victim is None:
+            break
+        _models.pop(victim)
+        evicted = True
+    if evicted:
+        gc.collect()
+
+
+def get_model(name):
+    """Returns the shared model for `name`, loading it once per process."""
+    with _lock:
+        if name in _models:
+            _models.move_to_end(name)
+            _models[name]["last_used"] = time.time()
+            return _models[name]["model"]
+        if name not in MODEL_SPECS:
+            raise KeyError(f"Unknown model '{name}'. Available: {', '.join(MODEL_SPECS)}")
+        load_lock = _load_locks.setdefault(name, threading.Lock())
+
+    # Load outside the registry lock so other models stay available meanwhile
+    with load_lock:
+        with _lock:
+            if name in _models:
+                _models.move_to_end(name)
+                return _models[name]["model"]
+
+        with _lock:
+            _loading.add(name)
+        try:
+            rss_before = process_rss()
+            start = time.perf_counter()
+            with profiled("model", name), span(f"load_model:{name}"):
+                model = MODEL_SPECS[name]["loader"]()
+            load_seconds = time.perf_counter() - start
+            rss_after = process_rss()
+        finally:
+            with _lock:
+                _loading.discard(name)
+
+        with _lock:
+            _models[name] = {
+                "model": model,
+                "model_id": MODEL_SPECS[name]["model_id"],
+                "bytes": _model_nbytes(model),
+                "rss_delta": rss_after - rss_before,
+                "load_seconds": load_seconds,
+                "last_used": time.time(),
+            }
+            _evict_over_budget(keep=name)
+        return model
+
+
+def is_loaded(name):
+    """Returns True when `name` is already resident in memory."""
+    with _lock:
+        return name in _models
+
+
+def loading_models():
+    """Returns the names of models that are being loaded right now."""
+    with _lock:
+        return sorted(_loading)
+
+
+def start_warmup(names=None):
+    """Loads models on a daemon thread so first page visits don't wait; runs once per process.
+
+    Failures are kept in `warmup_errors()` and the model is simply loaded (or fails) on first use.
+    """
+    global _warmup_thread
+    with _lock:
+        if _warmup_thread is not None:
+            return _warmup_thread
+        names = [name for name in (WARMUP_MODELS if names is None else names) if name in MODEL_SPECS]
+
+        def warm():
+            for name in names:
+                try:
+                    get_model(name)
+                except Exception as e:
+                    _warmup_errors[name] = str(e)
+
+        _warmup_thread = threading.Thread(target=warm, name="model-warmup", daemon=True)
+        _warmup_thread.start()
+        return _warmup_thread
+
+
+def warmup_errors():
+    """Returns {name: error message} for models that failed to load during warmup."""
+    with _lock:
+        return dict(_warmup_errors)
+
+
+def evict(name):
+    """Removes a model from the registry so its memory can be reclaimed."""
+    with _lock:
+        removed = _models.pop(name, None) is not None
+    if removed:
+        gc.collect()
+    return removed
+
+
+def set_memory_budget(megabytes):
+    """Changes the memory budget (MB, 0 = unlimited) and evicts if needed."""
+    global _budget_bytes
+    with _lock:
+        _budget_bytes = megabytes * 1024 * 1024
+        _evict_over_budget(keep=next(reversed(_models), None))
+
+
+def memory_report():
+    """Returns one row per resident model, most recently used first."""
+    with _lock:
+        return [
+            {
+                "Model": name,
+                "Model ID": entry["model_id"],
+                "Weights (MB)": round(entry["bytes"] / 1024 / 1024, 1),
+                "RSS Delta (MB)": round(entry["rss_delta"] / 1024 / 1024, 1),
+                "Load Time (s)": round(entry["load_seconds"], 2),
+                "Last Used": time.strftime("%H:%M:%S", time.localtime(entry["last_used"])),
+            }
+            for name, entry in reversed(_models.items())
+        ]
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import sqlite3
+import threading
+
+import pandas as pd
+
+from features.resources import cache_path
+
+_conn = None
+_lock = threading.Lock()
+
+ARTICLE_COLUMNS = ["Title", "Description", "Sentiment", "Matched Terms", "Published At", "URL"]
+
+
+def _get_conn():
+    """Opens the article store (SQLite, WAL mode) once per process."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(cache_path("news_store.sqlite3"), timeout=30, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                query TEXT NOT NULL,
+                url_hash TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                title TEXT,
+                description TEXT,
+                url TEXT,
+                published_at TEXT NOT NULL,
+                sentiment TEXT,
+                matched_terms TEXT,
+                PRIMARY KEY (query, url_hash),
+                UNIQUE (query, content_hash)
+            );
+            CREATE INDEX IF NOT EXISTS articles_published ON articles(query, published_at);
+        """)
+    return _conn
+
+
+def _hash(text):
+    return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+
+def article_keys(article):
+    """Returns (url hash, content hash) for a NewsAPI article dict."""
+    content = " ".join(f"{article.get('title') or ''} {article.get('description') or ''}".lower().split())
+    return _hash(article.get("url") or content), _hash(content)
+
+
+def high_water_mark(query):
+    """Returns the newest `publishedAt` stored for a query (ISO string), or None."""
+    with _lock:
+        row = _get_conn().execute("SELECT MAX(published_at) FROM articles WHERE query = ?", (query,)).fetchone()
+    return row[0]
+
+
+def unseen_articles(query, articles):
+    """Filters a fetched batch down to articles not yet stored for this query (deduplicated)."""
+    fresh = {}
+    for article in articles:
+        if not article.get("publishedAt"):
+            continue
+        url_hash, content_hash = article_keys(article)
+        fresh.setdefault(url_hash, (content_hash, article))
+    if not fresh:
+        return []
+
+    seen_contents = {content_hash for content_hash, _ in fresh.values()}
+    with _lock:
+        conn = _get_conn()
+        known = set()
+        keys = list(fresh)
+        for offset in range(0, len(keys), 500):
+            chunk = keys[offset:offset + 500]
+            known.update(row[0] for row in conn.execute(
+                f"SELECT url_hash FROM articles WHERE query = ? AND url_hash IN ({','.join('?' * len(chunk))})", [query] + chunk))
+        contents = list(seen_contents)
+        for offset in range(0, len(contents), 500):
+            chunk = contents[offset:offset + 500]
+            known_contents = {row[0] for row in conn.execute(
+                f"SELECT content_hash FROM articles WHERE query = ? AND content_hash IN ({','.join('?' * len(chunk))})", [query] + chunk)}
+            known.update(url_hash for url_hash, (content_hash, _) in fresh.items() if content_hash in known_contents)
+
+    result, taken_contents = [], set()
+    for url_hash, (content_hash, article) in fresh.items():
+        if url_hash not in known and content_hash not in taken_contents:
+            taken_contents.add(content_hash)
+            result.append(article)
+    return result
+
+
+def add_articles(query, articles, sentiments, matched_terms):
+    """Stores scored articles; duplicates by URL or content are ignored."""
+    rows = []
+    for article, sentiment, terms in zip(articles, sentiments, matched_terms):
+        url_hash, content_hash = article_keys(article)
+        rows.append((query, url_hash, content_hash, article.get("title"), article.get("description"),
+                     article.get("url"), article["publishedAt"], sentiment, json.dumps(list(terms))))
+    with _lock:
+        conn = _get_conn()
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+
+def load_articles(query):
+    """Returns every stored article for a query as the page's sentiment DataFrame, newest first."""
+    with _lock:
+        df = pd.read_sql_query(
+            "SELECT title, description, sentiment, matched_terms, published_at, url FROM articles "
+            "WHERE query = ? ORDER BY published_at DESC", _get_conn(), params=(query,))
+    df.columns = ARTICLE_COLUMNS
+    df["Matched Terms"] = df["Matched Terms"].map(lambda terms: json.loads(terms) if terms else [])
+    df["Published At"] = pd.to_datetime(df["Published At"]).dt.date
+    return df
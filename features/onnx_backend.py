@@ -0,0 +1,170 @@
+import os
+import platform
+import shutil
+import statistics
+import threading
+import time
+
+from features.instrumentation import process_rss
+from features.resources import cache_path
+
+# ✅ Quantized ONNX Runtime backend for the text-classification models (exported once, cached on disk)
+QUANTIZED_FILE = "model_quantized.onnx"
+PARITY_TEXTS = [
+    "I absolutely loved this movie, the cast was brilliant.",
+    "This was the worst customer service I have ever experienced.",
+    "The package arrived on Tuesday.",
+    "I'm so scared the results will be bad tomorrow.",
+    "What a wonderful surprise, thank you so much!",
+    "The update broke everything and nobody seems to care.",
+    "Honestly, I expected more from such an expensive product.",
+    "We finally won the championship after ten years!",
+    "He slammed the door and stormed out of the meeting.",
+    "The report is due next week and covers three regions.",
+    "I can't believe how disgusting the food was.",
+    "The new features are fine, nothing special.",
+]
+
+_export_lock = threading.Lock()
+
+
+def artifact_dir(model_id):
+    """Directory holding the exported and quantized ONNX model for `model_id`."""
+    return os.path.dirname(cache_path("onnx", model_id.replace("/", "--"), QUANTIZED_FILE))
+
+
+def _quantization_config():
+    """Picks the dynamic int8 configuration matching this CPU's instruction set."""
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    flags = ""
+    if os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as file:
+            flags = file.read()
+    if "avx512_vnni" in flags:
+        return AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    if "avx512f" in flags:
+        return AutoQuantizationConfig.avx512(is_static=False, per_channel=False)
+    return AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+
+
+def export_quantized(model_id):
+    """Exports `model_id` to ONNX and applies dynamic int8 quantization, once per machine.
+
+    Work happens in a private temporary directory that is renamed into place, so
+    concurrent processes (e.g. batch workers) never see a half-written model.
+    """
+    target = artifact_dir(model_id)
+    if os.path.exists(os.path.join(target, QUANTIZED_FILE)):
+        return target
+    with _export_lock:
+        if os.path.exists(os.path.join(target, QUANTIZED_FILE)):
+            return target
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from transformers import AutoTokenizer
+
+        staging = f"{target}.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        ORTModelForSequenceClassification.from_pretrained(model_id, export=True).save_pretrained(staging)
+        AutoTokenizer.from_pretrained(model_id).save_pretrained(staging)
+        quantizer = ORTQuantizer.from_pretrained(staging)
+        quantizer.quantize(save_dir=staging, quantization_config=_quantization_config())
+        shutil.rmtree(target, ignore_errors=True)
+        try:
+            os.replace(staging, target)
+        except OSError:  # Another process published it first
+            shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+def load_onnx_pipeline(task, model_id):
+    """Returns a transformers pipeline backed by the quantized ONNX model (same outputs as PyTorch)."""
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer, pipeline
+
+    directory = export_quantized(model_id)
+    model = ORTModelForSequenceClassification.from_pretrained(directory, file_name=QUANTIZED_FILE)
+    return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(directory))
+
+
+def _latencies(classifier, texts, repeats=3):
+    """Per-request latencies (ms) with batch size 1, after one warm-up call."""
+    classifier(texts[:1])
+    timings = []
+    for _ in range(repeats):
+        for text in texts:
+            start = time.perf_counter()
+            classifier([text])
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def compare_backends(task, model_id, texts=PARITY_TEXTS, batch_size=32):
+    """Runs PyTorch and quantized ONNX side by side on `texts`.
+
+    Returns (parity, rows): label agreement and score drift between the two backends,
+    and one row per backend with load time, RSS growth, p50/p95 latency and throughput.
+    PyTorch is loaded first, so its RSS growth includes importing torch.
+    """
+    from transformers import pipeline
+
+    loaders = {
+        "PyTorch": lambda: pipeline(task, model=model_id),
+        "ONNX int8": lambda: load_onnx_pipeline(task, model_id),
+    }
+    outputs, rows = {}, []
+    for backend, loader in loaders.items():
+        rss_before = process_rss()
+        start = time.perf_counter()
+        classifier = loader()
+        load_seconds = time.perf_counter() - start
+        rss_after = process_rss()
+
+        timings = _latencies(classifier, texts)
+        start = time.perf_counter()
+        outputs[backend] = classifier(texts, batch_size=batch_size, truncation=True)
+        batch_seconds = time.perf_counter() - start
+        rows.append({
+            "Backend": backend,
+            "Load (s)": round(load_seconds, 2),
+            "RSS Growth (MB)": round((rss_after - rss_before) / 1024 / 1024, 1),
+            "p50 Latency (ms)": round(statistics.median(timings), 2),
+            "p95 Latency (ms)": round(statistics.quantiles(timings, n=20)[-1], 2),
+            "Batched (texts/s)": round(len(texts) / max(batch_seconds, 1e-9), 1),
+        })
+
+    reference, candidate = outputs["PyTorch"], outputs["ONNX int8"]
+    same_label = [a["label"] == b["label"] for a, b in zip(reference, candidate)]
+    score_drift = [abs(a["score"] - b["score"]) for a, b, same in zip(reference, candidate, same_label) if same]
+    parity = {
+        "Texts": len(texts),
+        "Label Agreement": round(sum(same_label) / len(texts), 4),
+        "Max Score Drift": round(max(score_drift), 4) if score_drift else None,
+        "Mean Score Drift": round(statistics.fmean(score_drift), 4) if score_drift else None,
+        "Disagreements": [text for text, same in zip(texts, same_label) if not same],
+    }
+    return parity, rows
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from features.model_registry import EMOTION_MODEL_ID, SENTIMENT_MODEL_ID
+
+    models = {"sentiment": ("sentiment-analysis", SENTIMENT_MODEL_ID), "emotion": ("text-classification", EMOTION_MODEL_ID)}
+    parser = argparse.ArgumentParser(description="Compare the PyTorch and quantized ONNX backends.")
+    parser.add_argument("model", choices=sorted(models))
+    parser.add_argument("--input", help="Optional CSV with a Text column to use instead of the built-in sentences.")
+    parser.add_argument("--min-agreement", type=float, default=0.95, help="Exit with status 1 below this label agreement.")
+    args = parser.parse_args()
+
+    texts = PARITY_TEXTS
+    if args.input:
+        import pandas as pd
+        texts = pd.read_csv(args.input)["Text"].dropna().astype(str).tolist()
+    parity, rows = compare_backends(*models[args.model], texts=texts)
+    print(json.dumps({"parity": parity, "backends": rows}, indent=2))
+    raise SystemExit(0 if parity["Label Agreement"] >= args.min_agreement else 1)
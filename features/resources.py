@@ -0,0 +1,27 @@
+import os
+
+# ✅ Shared on-disk cache directory for models, inference results and indexes
+CACHE_DIR = os.getenv("NLP_NAVIGATOR_CACHE_DIR", ".cache")
+
+
+def cache_path(*parts):
+    """Returns a path inside the cache directory, creating parent folders."""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+# ✅ Download an NLTK resource only if it is missing (once per process)
+_nltk_ready = set()
+
+
+def ensure_nltk_data(resource, package):
+    """Makes sure an NLTK resource (e.g. "tokenizers/punkt_tab") is available."""
+    if resource in _nltk_ready:
+        return
+    import nltk
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(package, quiet=True)
+    _nltk_ready.add(resource)
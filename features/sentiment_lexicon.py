@@ -0,0 +1,111 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+
+from features.resources import cache_path
+from features.inference import model_revision, run_cached, signed_score
+from features.model_registry import MODEL_SPECS, get_model
+
+LEXICON_MODEL = "sentiment"
+FLUSH_EVERY_WORDS = 500  # Newly scored words kept in memory before the lexicon file is rewritten
+
+_lexicon = None
+_lexicon_path = None
+_unsaved_words = 0
+_lexicon_lock = threading.Lock()
+
+
+def is_scorable(token):
+    """Returns True for tokens worth sending to the model (skips punctuation and numbers)."""
+    return any(char.isalpha() for char in token)
+
+
+def score_unique_words(tokens, batch_size=128):
+    """Scores each distinct token once and broadcasts the scores back to token positions."""
+    vocabulary = list(dict.fromkeys(token for token in tokens if is_scorable(token)))
+    results = run_cached(LEXICON_MODEL, vocabulary, batch_size=batch_size)
+    scores = {word: signed_score(result) for word, result in zip(vocabulary, results)}
+    return [scores.get(token, 0) for token in tokens]
+
+
+def lexicon_path():
+    """Returns the on-disk location of the lexicon for the current model weights."""
+    model = get_model(LEXICON_MODEL)
+    model_id = MODEL_SPECS[LEXICON_MODEL]["model_id"].replace("/", "--")
+    return cache_path("lexicons", f"{model_id}-{model_revision(model) or 'main'}.json")
+
+
+def _tokenizer_vocabulary():
+    """Returns the whole-word entries of the sentiment model's tokenizer vocabulary."""
+    tokenizer = get_model(LEXICON_MODEL).tokenizer
+    return sorted(
+        word for word in tokenizer.get_vocab()
+        if word.isalpha() and len(word) > 1 and not word.startswith("##")
+    )
+
+
+def _save_lexicon(lexicon, path):
+    """Writes the lexicon atomically so readers never see a partial file (call with _lexicon_lock held)."""
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(path), suffix=".tmp",
+                                     delete=False) as file:
+        json.dump(lexicon, file)
+    os.replace(file.name, path)
+
+
+def build_lexicon(words=None, batch_size=128, progress_callback=None):
+    """Scores every word once with the model and stores the word -> polarity table on disk."""
+    global _lexicon, _lexicon_path, _unsaved_words
+    words = words if words is not None else _tokenizer_vocabulary()
+    results = run_cached(LEXICON_MODEL, words, batch_size=batch_size, progress_callback=progress_callback)
+    lexicon = {word: round(signed_score(result), 4) for word, result in zip(words, results)}
+    path = lexicon_path()
+    with _lexicon_lock:
+        _save_lexicon(lexicon, path)
+        _lexicon, _lexicon_path, _unsaved_words = lexicon, path, 0
+    return lexicon
+
+
+def load_lexicon():
+    """Returns the stored lexicon (loaded once per process), or None if not built yet."""
+    global _lexicon, _lexicon_path
+    with _lexicon_lock:
+        if _lexicon is None:
+            path = lexicon_path()
+            if not os.path.exists(path):
+                return None
+            with open(path, "r", encoding="utf-8") as file:
+                _lexicon, _lexicon_path = json.load(file), path
+        return _lexicon
+
+
+@atexit.register
+def flush_lexicon():
+    """Writes words scored since the last save to the lexicon file (also run at exit)."""
+    global _unsaved_words
+    with _lexicon_lock:
+        if _unsaved_words and _lexicon is not None:
+            _save_lexicon(_lexicon, _lexicon_path)
+            _unsaved_words = 0
+
+
+def lookup_scores(tokens, lexicon):
+    """Looks tokens up in the lexicon, scoring (and remembering) only unseen words.
+
+    New words are added in memory; the file is rewritten once FLUSH_EVERY_WORDS have
+    accumulated, and on exit.
+    """
+    global _unsaved_words
+    normalized = [token.lower() for token in tokens]
+    missing = list(dict.fromkeys(token for token in normalized if is_scorable(token) and token not in lexicon))
+    if missing:
+        scores = score_unique_words(missing)
+        with _lexicon_lock:
+            lexicon.update((word, round(score, 4)) for word, score in zip(missing, scores))
+            if lexicon is _lexicon:  # Only the stored lexicon is written back
+                _unsaved_words += len(missing)
+                if _unsaved_words >= FLUSH_EVERY_WORDS:
+                    _save_lexicon(_lexicon, _lexicon_path)
+                    _unsaved_words = 0
+    return [lexicon.get(token, 0) for token in normalized]
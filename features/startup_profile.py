@@ -0,0 +1,95 @@
+import importlib.abc
+import importlib.util
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# ✅ Opt-in: NLP_NAVIGATOR_PROFILE_STARTUP=1 records import and model load times for this process
+PROFILE_ENABLED = os.getenv("NLP_NAVIGATOR_PROFILE_STARTUP", "").lower() in ("1", "true", "yes")
+
+_process_start = time.perf_counter()
+_records = []
+_records_lock = threading.Lock()
+_installed = False
+
+
+def record(kind, name, seconds):
+    """Stores one timing (kind is e.g. "import" or "model") when profiling is enabled."""
+    if not PROFILE_ENABLED:
+        return
+    with _records_lock:
+        _records.append({
+            "Kind": kind,
+            "Name": name,
+            "Seconds": round(seconds, 3),
+            "Finished At (s)": round(time.perf_counter() - _process_start, 2),
+            "Thread": threading.current_thread().name,
+        })
+
+
+@contextmanager
+def profiled(kind, name):
+    """Times the enclosed block; costs a single flag check when profiling is disabled."""
+    if not PROFILE_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, name, time.perf_counter() - start)
+
+
+class _TimedLoader:
+    """Wraps a module loader to time its top-level import (cumulative, including its own imports)."""
+
+    def __init__(self, loader, name):
+        self._loader = loader
+        self._name = name
+
+    def __getattr__(self, attribute):
+        return getattr(self._loader, attribute)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with profiled("import", self._name):
+            self._loader.exec_module(module)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path hook that times the first import of every top-level package."""
+
+    def __init__(self):
+        self._resolving = set()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if "." in fullname or fullname in self._resolving:
+            return None
+        self._resolving.add(fullname)
+        try:
+            spec = importlib.util.find_spec(fullname)
+        finally:
+            self._resolving.discard(fullname)
+        if spec is None or spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return None
+        spec.loader = _TimedLoader(spec.loader, fullname)
+        return spec
+
+
+def install():
+    """Starts recording top-level import times (once per process, only when enabled)."""
+    global _installed
+    if not PROFILE_ENABLED or _installed:
+        return
+    sys.meta_path.insert(0, _ImportTimer())
+    _installed = True
+
+
+def profile_report():
+    """Returns the recorded timings, slowest first."""
+    with _records_lock:
+        return sorted(_records, key=lambda row: row["Seconds"], reverse=True)
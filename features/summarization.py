@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from features.resources import ensure_nltk_data
+from features.inference import run_cached
+from features.model_registry import get_model
+
+WINDOW_TOKENS = 900  # distilbart-cnn accepts 1024 tokens; leave room for special tokens
+CHUNK_SUMMARY = {"max_length": 150, "min_length": 40, "do_sample": False}
+
+
+def split_into_windows(text, tokenizer, max_tokens=WINDOW_TOKENS):
+    """Packs whole sentences into windows of at most `max_tokens` tokens.
+
+    A single sentence longer than a window is cut at token boundaries.
+    """
+    ensure_nltk_data("tokenizers/punkt_tab", "punkt_tab")
+    from nltk.tokenize import sent_tokenize
+
+    sentences = sent_tokenize(text)
+    if not sentences:
+        return []
+    token_ids = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+
+    windows, current, current_tokens = [], [], 0
+    for sentence, ids in zip(sentences, token_ids):
+        if len(ids) > max_tokens:
+            pieces = [(tokenizer.decode(ids[i:i + max_tokens]), len(ids[i:i + max_tokens])) for i in range(0, len(ids), max_tokens)]
+        else:
+            pieces = [(sentence, len(ids))]
+        for piece, piece_tokens in pieces:
+            if current and current_tokens + piece_tokens > max_tokens:
+                windows.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        windows.append(" ".join(current))
+    return windows
+
+
+def summarize_windows(windows, batch_size=4, workers=1, on_chunk=None, **params):
+    """Summarizes windows in batches (optionally on several threads), streaming each result.
+
+    `on_chunk(index, summary)` is called as soon as each window's summary is ready.
+    Returns the summaries in window order.
+    """
+    batches = [list(range(i, min(i + batch_size, len(windows)))) for i in range(0, len(windows), batch_size)]
+    summaries = [None] * len(windows)
+
+    def summarize_batch(indices):
+        outputs = run_cached("summarizer", [windows[i] for i in indices], batch_size=len(indices), **params)
+        return indices, [output["summary_text"] for output in outputs]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(summarize_batch, indices) for indices in batches]
+        for future in as_completed(futures):
+            indices, texts = future.result()
+            for i, summary in zip(indices, texts):
+                summaries[i] = summary
+                if on_chunk:
+                    on_chunk(i, summary)
+    return summaries
+
+
+def summarize_long(text, final_params, batch_size=4, workers=1, max_tokens=WINDOW_TOKENS, on_chunk=None, on_level=None):
+    """Map-reduce summarization: summarize windows, then recursively summarize the joined summaries.
+
+    `on_level(level, window_count)` is called before each round and `on_chunk(level, index, summary)`
+    for every partial summary. Text that fits one window gets a single pass with `final_params`.
+    """
+    tokenizer = get_model("summarizer").tokenizer
+    windows = split_into_windows(text, tokenizer, max_tokens)
+    level = 0
+    while len(windows) > 1:
+        level += 1
+        if on_level:
+            on_level(level, len(windows))
+        summaries = summarize_windows(
+            windows, batch_size=batch_size, workers=workers,
+            on_chunk=(lambda i, summary, level=level: on_chunk(level, i, summary)) if on_chunk else None,
+            **CHUNK_SUMMARY,
+        )
+        next_windows = split_into_windows(" ".join(summaries), tokenizer, max_tokens)
+        if len(next_windows) >= len(windows):  # Summaries stopped shrinking; avoid looping forever
+            next_windows = [" ".join(next_windows)]
+        windows = next_windows
+    if not windows:
+        return ""
+    return run_cached("summarizer", windows, **final_params)[0]["summary_text"]
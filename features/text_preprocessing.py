@@ -0,0 +1,103 @@
+import codecs
+import re
+from collections import Counter
+from functools import lru_cache
+
+from features.resources import ensure_nltk_data
+
+# ✅ One compiled tokenizer shared by every page (words, keeping inner apostrophes/hyphens)
+TOKEN_PATTERN = re.compile(r"\w+(?:['’-]\w+)*")
+CHUNK_BYTES = 1 << 20  # Bytes read per chunk when streaming uploads
+STEM_CACHE_SIZE = 200_000
+
+
+@lru_cache(maxsize=None)
+def get_stop_words(language="english"):
+    """Returns the NLTK stop word set, downloading and loading it once per process."""
+    ensure_nltk_data("corpora/stopwords", "stopwords")
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words(language))
+
+
+@lru_cache(maxsize=None)
+def _stemmer():
+    from nltk.stem import PorterStemmer
+    return PorterStemmer()
+
+
+@lru_cache(maxsize=None)
+def _lemmatizer():
+    ensure_nltk_data("corpora/wordnet", "wordnet")
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(word):
+    """Porter stem of a word, memoized (vocabularies repeat far more than they grow)."""
+    return _stemmer().stem(word)
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def lemmatize(word):
+    """WordNet lemma of a word, memoized."""
+    return _lemmatizer().lemmatize(word)
+
+
+def tokenize(text, lowercase=False):
+    """Splits text into word tokens with the shared compiled pattern."""
+    tokens = TOKEN_PATTERN.findall(text)
+    return [token.lower() for token in tokens] if lowercase else tokens
+
+
+def preprocess(text, lowercase=False, remove_stop_words=False, apply_stemming=False, apply_lemmatization=False,
+               language="english"):
+    """Tokenizes text and applies the selected cleaning steps, returning the token list."""
+    tokens = tokenize(text, lowercase=lowercase)
+    if remove_stop_words:
+        stop_words = get_stop_words(language)
+        tokens = [token for token in tokens if token.lower() not in stop_words]
+    if apply_lemmatization:
+        tokens = [lemmatize(token) for token in tokens]
+    if apply_stemming:
+        tokens = [stem(token) for token in tokens]
+    return tokens
+
+
+def iter_text_chunks(file, chunk_bytes=CHUNK_BYTES, encoding="utf-8"):
+    """Streams a binary file-like object as text chunks that never split a word."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+    carry = ""
+    while True:
+        data = file.read(chunk_bytes)
+        text = carry + decoder.decode(data, final=not data)
+        if not data:
+            if text:
+                yield text
+            return
+        cut = max(text.rfind(" "), text.rfind("\n"))
+        if cut == -1:
+            carry = text
+            continue
+        yield text[:cut + 1]
+        carry = text[cut + 1:]
+
+
+def iter_processed_chunks(file, **options):
+    """Streams a file through `preprocess`, yielding one token list per chunk."""
+    for chunk in iter_text_chunks(file):
+        yield preprocess(chunk, **options)
+
+
+def ngram_counts(token_chunks, n=2, counter=None):
+    """Counts n-grams over a stream of token lists, including n-grams that span chunk borders."""
+    counter = counter if counter is not None else Counter()
+    tail = []
+    for tokens in token_chunks:
+        window = tail + list(tokens)
+        if n == 1:
+            counter.update(window)
+        else:
+            counter.update(" ".join(window[i:i + n]) for i in range(len(window) - n + 1))
+        tail = window[-(n - 1):] if n > 1 else []
+    return counter
@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import datetime, timezone
+
+import yaml
+from yaml.loader import SafeLoader
+
+# ✅ SQLite user database (keyed lookups, atomic inserts); config.yaml is only read for the one-time migration
+USERS_DB = os.getenv("NLP_NAVIGATOR_USERS_DB", "users.sqlite3")
+CONFIG_FILE = "config.yaml"
+
+_initialized = set()
+_credentials = {"usernames": {}}
+_credentials_rowid = 0
+_credentials_lock = threading.Lock()
+_hash_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="password-hash")  # Caps concurrent bcrypt work
+
+
+def _connect(path=USERS_DB):
+    """Opens a connection, creating the schema and migrating config.yaml on first use."""
+    conn = sqlite3.connect(path, timeout=30)
+    if path not in _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "username TEXT PRIMARY KEY, name TEXT, email TEXT, password TEXT NOT NULL, created_at TEXT NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY)")
+        _migrate_yaml(conn)
+        _initialized.add(path)
+    return conn
+
+
+def _read_config():
+    if not os.path.exists(CONFIG_FILE):
+        return {}
+    with open(CONFIG_FILE, "r", encoding="utf-8") as file:
+        return yaml.load(file, Loader=SafeLoader) or {}
+
+
+def _migrate_yaml(conn):
+    """Copies the users from config.yaml into the database exactly once."""
+    with conn:
+        if not conn.execute("INSERT OR IGNORE INTO migrations VALUES ('config_yaml')").rowcount:
+            return
+        usernames = (_read_config().get("credentials") or {}).get("usernames") or {}
+        conn.executemany(
+            "INSERT OR IGNORE INTO users VALUES (?, ?, ?, ?, ?)",
+            [(username, user.get("name"), user.get("email"), user["password"], "config.yaml")
+             for username, user in usernames.items() if user.get("password")],
+        )
+
+
+def cookie_config():
+    """Returns the cookie settings (name, key, expiry_days) from config.yaml, if present."""
+    return _read_config().get("cookie", {})
+
+
+def get_user(username):
+    """Returns a user's record as a dict, or None."""
+    with closing(_connect()) as conn:
+        row = conn.execute("SELECT name, email, password FROM users WHERE username = ?", (username,)).fetchone()
+    return dict(zip(["name", "email", "password"], row)) if row else None
+
+
+def user_exists(username):
+    """Returns True if the username is taken."""
+    with closing(_connect()) as conn:
+        return conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is not None
+
+
+def hash_password(password):
+    """Hashes a password with bcrypt on the shared worker pool; returns a Future.
+
+    The pool is process-wide, so a burst of registrations hashes at most two passwords
+    at a time instead of one per session thread.
+    """
+    import streamlit_authenticator as stauth
+    return _hash_executor.submit(lambda: stauth.Hasher().hash(password))
+
+
+def add_user(username, name, email, password_hash):
+    """Inserts a user atomically; returns False if the username already exists."""
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO users VALUES (?, ?, ?, ?, ?)",
+                (username, name, email, password_hash, datetime.now(timezone.utc).isoformat(timespec="seconds")),
+            )
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+
+def load_credentials():
+    """Returns the credentials dict expected by streamlit-authenticator.
+
+    The full table is read once per process; later calls only fetch users added
+    since (by rowid), so a registration costs O(1) rather than a full reload.
+    """
+    global _credentials_rowid
+    with _credentials_lock:
+        with closing(_connect()) as conn:
+            rows = conn.execute(
+                "SELECT rowid, username, name, email, password FROM users WHERE rowid > ? ORDER BY rowid",
+                (_credentials_rowid,),
+            ).fetchall()
+        for rowid, username, name, email, password in rows:
+            _credentials["usernames"].setdefault(username, {}).update(name=name, email=email, password=password)
+            _credentials_rowid = rowid
+        return _credentials
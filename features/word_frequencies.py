@@ -0,0 +1,126 @@
+import hashlib
+import io
+import json
+import os
+from collections import Counter
+
+from features.csv_ingestion import CSVChunkReader
+from features.resources import cache_path
+from features.text_preprocessing import iter_text_chunks, preprocess
+
+MAX_LAYOUT_WORDS = 2_000  # Vocabulary cap handed to the word cloud layout step
+CSV_CHUNK_ROWS = 50_000
+# ✅ Size cap for the rendered word cloud PNGs (MB); least recently used images are removed first
+WORDCLOUD_CACHE_MAX_MB = float(os.getenv("NLP_NAVIGATOR_WORDCLOUD_CACHE_MB", "128"))
+
+
+def _file_size(file):
+    position = file.tell()
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(position)
+    return size
+
+
+def count_text(text, counter=None, **options):
+    """Adds the word counts of a string to `counter` (a new Counter by default)."""
+    counter = counter if counter is not None else Counter()
+    counter.update(preprocess(text, lowercase=True, remove_stop_words=True, **options))
+    return counter
+
+
+def count_text_file(file, progress_callback=None, **options):
+    """Streams a binary text file into a Counter without holding it in memory.
+
+    `progress_callback(bytes_read, total_bytes)` is called after every chunk.
+    """
+    total = _file_size(file)
+    counter = Counter()
+    for chunk in iter_text_chunks(file):
+        count_text(chunk, counter, **options)
+        if progress_callback:
+            progress_callback(file.tell(), total)
+    return counter
+
+
+def count_csv_column(file, column, chunk_rows=CSV_CHUNK_ROWS, progress_callback=None, **options):
+    """Streams one CSV column into a Counter, reading `chunk_rows` rows at a time."""
+    total = _file_size(file)
+    counter = Counter()
+    for chunk in CSVChunkReader(file, [column], dropna=[column], chunk_rows=chunk_rows):
+        for text in chunk[column]:
+            count_text(text, counter, **options)
+        if progress_callback:
+            progress_callback(file.tell(), total)
+    return counter
+
+
+def top_frequencies(frequencies, max_words=MAX_LAYOUT_WORDS):
+    """Returns the `max_words` most frequent words as a dict, ties broken alphabetically."""
+    return dict(sorted(frequencies.items(), key=lambda item: (-item[1], item[0]))[:max_words])
+
+
+def frequency_hash(frequencies):
+    """Content hash of a frequency table, independent of insertion order."""
+    payload = json.dumps(sorted(frequencies.items()), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _evict_word_clouds(directory, max_bytes=WORDCLOUD_CACHE_MAX_MB * 1024 * 1024):
+    """Deletes least recently used PNGs (by mtime, refreshed on every hit) until the cache is at 90% of its cap."""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".png"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # Removed by another session meanwhile
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return
+    target = max_bytes * 0.9
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def render_word_cloud(frequencies, width=800, height=400, background_color="white", colormap="viridis",
+                      max_words=MAX_LAYOUT_WORDS):
+    """Renders a word cloud PNG, reusing a cached image for identical frequencies and options.
+
+    Returns (png_bytes, from_cache).
+    """
+    from wordcloud import WordCloud
+
+    frequencies = top_frequencies(frequencies, max_words)
+    options = {"width": width, "height": height, "background_color": background_color, "colormap": colormap,
+               "max_words": max_words}
+    key = hashlib.sha256(
+        f"{frequency_hash(frequencies)}|{json.dumps(options, sort_keys=True)}".encode("utf-8")
+    ).hexdigest()
+    path = cache_path("wordclouds", f"{key}.png")
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as file:
+                png = file.read()
+            os.utime(path)  # Marks the image as recently used for eviction
+            return png, True
+        except FileNotFoundError:  # Evicted between the check and the read
+            pass
+
+    image = WordCloud(**options).generate_from_frequencies(frequencies).to_image()
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    png = buffer.getvalue()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(png)
+    os.replace(tmp_path, path)
+    _evict_word_clouds(os.path.dirname(path))
+    return png, False